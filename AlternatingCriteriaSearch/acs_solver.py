@@ -0,0 +1,116 @@
+r"""Alternating Criteria Search on a small binary MIP, in pure NumPy.
+
+The instance is
+
+    min c^T x,  Ax = b,  x \in {0, 1}^n
+
+Every iteration fixes most of the variables to the current solution and
+solves the two auxiliary problems by enumerating the free ones: FMIP, the
+least infeasible solution (the slacks are |Ax - b|), then OMIP, the best
+objective that is not more infeasible. The search stops when the
+infeasibility reaches zero.
+"""
+
+import multiprocessing
+import queue
+
+import numpy as np
+
+MAX_ITERATIONS = 20
+
+
+def make_instance(n=14, m=5, seed=3):
+    """Random feasible instance ``(c, A, b)`` with ``n`` variables and
+    ``m`` constraints."""
+    rng = np.random.default_rng(seed)
+    A = rng.integers(-3, 4, size=(m, n))
+    b = A @ rng.integers(0, 2, size=n)
+    c = rng.integers(-5, 6, size=n)
+    return c, A, b
+
+
+def _neighbours(c, A, b, x, free):
+    # Every assignment of the free variables, the others as in x.
+    values = (np.arange(2 ** len(free))[:, None] >> np.arange(len(free))) & 1
+    candidates = np.repeat(x[None], len(values), axis=0)
+    candidates[:, free] = values
+    infeasibility = np.abs(candidates @ A.T - b).sum(axis=1)
+    return candidates, infeasibility, candidates @ c
+
+
+def solve(c, A, b, free=8, iterations=MAX_ITERATIONS, seed=0):
+    """Run ACS from ``x = 0``, yielding ``(infeasibility, objective)`` at
+    the start and after every iteration."""
+    rng = np.random.default_rng(seed)
+    x = np.zeros(len(c), dtype=int)
+    yield int(np.abs(A @ x - b).sum()), int(c @ x)
+
+    for _ in range(iterations):
+        # FMIP.
+        candidates, infeasibility, objective = _neighbours(
+            c, A, b, x, rng.choice(len(c), size=free, replace=False)
+        )
+        best = np.lexsort((objective, infeasibility))[0]
+        x, bound = candidates[best], infeasibility[best]
+
+        # OMIP, x itself is among the candidates.
+        candidates, infeasibility, objective = _neighbours(
+            c, A, b, x, rng.choice(len(c), size=free, replace=False)
+        )
+        allowed = np.flatnonzero(infeasibility <= bound)
+        best = allowed[
+            np.lexsort((infeasibility[allowed], objective[allowed]))[0]
+        ]
+        x = candidates[best]
+
+        yield int(infeasibility[best]), int(objective[best])
+        if infeasibility[best] == 0:
+            return
+
+
+def _run(results, kwargs):
+    try:
+        for point in solve(*make_instance(), **kwargs):
+            results.put(point)
+    finally:
+        results.put(None)
+
+
+class BackgroundSolve:
+    """``solve`` on ``make_instance()`` running in another process.
+
+    ``points`` holds the ``(infeasibility, objective)`` received so far.
+    """
+
+    def __init__(self, **kwargs):
+        self.points = []
+        self.done = False
+        self._results = multiprocessing.Queue()
+        self._process = multiprocessing.Process(
+            target=_run, args=(self._results, kwargs), daemon=True
+        )
+        self._process.start()
+
+    @classmethod
+    def finished(cls, **kwargs):
+        """Same as ``BackgroundSolve(**kwargs)``, solved in this process
+        before returning."""
+        solver = cls.__new__(cls)
+        solver.points = list(solve(*make_instance(), **kwargs))
+        solver.done = True
+        return solver
+
+    def get(self, index):
+        """Point ``index``, waiting for the solver only if it is not there
+        yet, or ``None`` when the search stopped before it."""
+        while index >= len(self.points) and not self.done:
+            try:
+                point = self._results.get(timeout=1)
+            except queue.Empty:
+                self.done = not self._process.is_alive()
+                continue
+            if point is None:
+                self.done = True
+            else:
+                self.points.append(point)
+        return self.points[index] if index < len(self.points) else None
@@ -1,5 +1,19 @@
 from manim import *
 import math
+import os
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from common import tex_cache
+from common.env import SECTION_ENV
+from common.named_tex import NamedMathTex
+from common.sections import SectionScene
+
+import acs_solver
+
+# Share the compiled LaTeX between renders.
+tex_cache.install()
 
 # Helper functions.
 
@@ -7,51 +21,67 @@ def make_title(title):
     return Title(title, color=ORANGE)
 
 
-class ACS(Scene):
+class ACS(SectionScene):
+
+    sections = ("intro", "submip_description", "acs_algorithm", "convergence")
+    checkpoint_attrs = ("eq_dic", "label_dic")
 
     def __init__(self):
-        Scene.__init__(self)
+        SectionScene.__init__(self)
+
+        # Solve the example shown in the convergence section while the
+        # previous sections render, when that section is rendered. Dry runs,
+        # e.g. the LaTeX precompilation, solve it in place when they get there.
+        self.solver = None
+        if not config.dry_run and (
+            (os.environ.get(SECTION_ENV) or "convergence") == "convergence"
+        ):
+            self.solver = acs_solver.BackgroundSolve()
 
         # Declare the latex formulas.
+        # Parts referred to by the animations are tagged with \named.
         mip_latex = (
             r"\begin{cases}"
-                r"\min c^Tx\\"
-                r"Ax = b\\"
-                r"l \leq x \leq u"
-                r"\\ x_i \in \mathbb Z"
-                r"\quad \forall i\in I"
+                r"\named{objective}{\min c^Tx}\\"
+                r"\named{constraints}{Ax = b}\\"
+                r"\named{bounds}{l \leq x \leq u}"
+                r"\\ \named{integrality}{x_i \in \mathbb Z"
+                r"\quad \forall i\in I}"
             r"\end{cases}"
         )
 
         fmip_latex = (
             r"\begin{cases}"
                 r"\min \sum\limits_{i=0}^{m-1} \Delta_i^+ + \Delta_i^- \\"
-                r"Ax + I_m \Delta^+ - I_m \Delta^- = b \\"
-                r"x_i = \tilde x_i \quad \forall i \in F \\"
-                r"l \leq x \leq u\\"
-                r"x_i \in \mathbb{Z} \quad \forall i \in I\\"
-                r"\Delta^+ \geq 0,\quad \Delta^- \geq 0"
+                r"\named{Ax}{Ax} + \named{slack}{I_m \Delta^+ - I_m \Delta^-}"
+                r" \named{rhs}{= b} \\"
+                r"\named{fixing}{x_i = \tilde x_i \quad \forall i \in F} \\"
+                r"\named{bounds}{l \leq x \leq u}\\"
+                r"\named{integrality}{x_i \in \mathbb{Z} \quad \forall i \in I}\\"
+                r"\named{slack-bounds}{\Delta^+ \geq 0,\quad \Delta^- \geq 0}"
             r"\end{cases}"
         )
 
         omip_latex = (
             r"\begin{cases}"
-                r"\min c^Tx\\"
-                r"Ax + I_m \Delta^+ - I_m \Delta^- = b \\"
-                r"\sum\limits_{i=0}^{m-1} \Delta^+_i + \Delta^-_i \leq \sum\limits_{i=0}^{m-1} \hat \Delta^+_i + \hat \Delta^-_i\\"
-                r"x_i = \hat x_i \quad \forall i \in F \\"
-                r"l \leq x \leq u\\"
-                r"x_i \in \mathbb Z \quad \forall i\in I\\"
-                r"\Delta^+ \geq 0,\quad \Delta^- \geq 0"
+                r"\named{objective}{\min c^Tx}\\"
+                r"\named{Ax}{Ax} \named{slack-term}{+ \named{slack}{I_m \Delta^+ - I_m \Delta^-}}"
+                r" \named{rhs}{= b} \\"
+                r"\named{infeasibility}{\sum\limits_{i=0}^{m-1} \Delta^+_i + \Delta^-_i \leq}"
+                r" \named{infeasibility-bound}{\sum\limits_{i=0}^{m-1} \hat \Delta^+_i + \hat \Delta^-_i}\\"
+                r"\named{fixing}{x_i = \hat x_i \quad \forall i \in F} \\"
+                r"\named{bounds}{l \leq x \leq u}\\"
+                r"\named{integrality}{x_i \in \mathbb Z \quad \forall i\in I}\\"
+                r"\named{slack-bounds}{\Delta^+ \geq 0,\quad \Delta^- \geq 0}"
             r"\end{cases}"
         )
 
 
         # Define the equations.
         self.eq_dic = {
-                "mip":  MathTex(mip_latex, font_size=40),
-                "fmip": MathTex(fmip_latex, font_size=30),
-                "omip": MathTex(omip_latex, font_size=30)
+                "mip":  NamedMathTex(mip_latex, font_size=40),
+                "fmip": NamedMathTex(fmip_latex, font_size=30),
+                "omip": NamedMathTex(omip_latex, font_size=30)
         }
 
         # Define the label for each equation.
@@ -62,13 +92,6 @@ class ACS(Scene):
         }
 
 
-    def construct(self):
-        self.intro()
-        self.submip_description()
-        self.acs_algorithm()
-        self.convergence()
-
-
     def intro(self):
         # Plot the title.
         title = make_title("Alternating Criteria Search")
@@ -79,23 +102,29 @@ class ACS(Scene):
         self.eq_dic["mip"].next_to(title, DOWN)
         self.label_dic["mip"].next_to(self.eq_dic["mip"], DOWN, buff=0.3)
         self.play(Write(self.label_dic["mip"]), Write(self.eq_dic["mip"]))
-        #self.add(index_labels(self.eq_dic["mip"][0]))
         self.wait(2)
 
         # Plot the FMIP formulation.
         self.eq_dic["fmip"].to_edge(DOWN).to_edge(LEFT)
         self.label_dic["fmip"].next_to(self.eq_dic["fmip"], UP, buff=0.3)
         self.play(Write(self.label_dic["fmip"]), Write(self.eq_dic["fmip"]))
-        #self.add(index_labels(self.eq_dic["fmip"][0]))
         self.wait(2)
 
         # Plot the OMIP formulation.
         self.eq_dic["omip"].to_edge(DOWN).to_edge(RIGHT)
         self.label_dic["omip"].next_to(self.eq_dic["omip"], UP, buff=0.3)
         self.play(Write(self.label_dic["omip"]), Write(self.eq_dic["omip"]))
-        #self.add(index_labels(self.eq_dic["omip"][0]))
         self.wait(2)
 
+        # The formulas stay on screen until the end, keep them behind the
+        # titles and overlays so they are not rasterized again for every
+        # frame. MIP goes last, it is the first to fade out.
+        self.keep_in_background(
+            self.eq_dic["fmip"], self.label_dic["fmip"],
+            self.eq_dic["omip"], self.label_dic["omip"],
+            self.eq_dic["mip"], self.label_dic["mip"],
+        )
+
         # Highlight the constrains using the boxes.
         self.higlights_constraints()
 
@@ -103,29 +132,29 @@ class ACS(Scene):
 
 
     def higlights_constraints(self):
-        # Define box specs: (label, index range, color, wait time)
+        # Define box specs: (label, parts, color, wait time)
         box_specs = [
             # Bounds + integrality
-            ("mip",  slice(19, 32), GREEN, 1),
-            ("fmip", slice(64, 77), GREEN, 0.5),
-            ("omip", slice(88,101), GREEN, 0.5),
+            ("mip",  ("bounds", "integrality"), GREEN, 1),
+            ("fmip", ("bounds", "integrality"), GREEN, 0.5),
+            ("omip", ("bounds", "integrality"), GREEN, 0.5),
 
             # Constraints
-            ("mip",  slice(15, 19), BLUE, 1),
-            ("fmip", slice(40, 42), BLUE, 0.5),
-            ("fmip", slice(52, 54), BLUE, 0),
-            ("omip", slice(33, 35), BLUE, 0.5),
-            ("omip", slice(45, 47), BLUE, 0.5),
+            ("mip",  ("constraints",), BLUE, 1),
+            ("fmip", ("Ax",), BLUE, 0.5),
+            ("fmip", ("rhs",), BLUE, 0),
+            ("omip", ("Ax",), BLUE, 0.5),
+            ("omip", ("rhs",), BLUE, 0.5),
 
             # Objective functions
-            ("mip",  slice(9, 15), PURPLE, 1),
-            ("omip", slice(27, 33), PURPLE, 0.5),
+            ("mip",  ("objective",), PURPLE, 1),
+            ("omip", ("objective",), PURPLE, 0.5),
         ]
 
         # Draw the boxes.
         boxes = VGroup()
-        for key, span, color, wait_time in box_specs:
-            mobj = self.eq_dic[key][0][span]
+        for key, parts, color, wait_time in box_specs:
+            mobj = self.eq_dic[key].part(*parts)
             box = SurroundingRectangle(mobj, color=color)
             boxes.add(box)
 
@@ -153,19 +182,19 @@ class ACS(Scene):
         # Higlight slacks variables.
         box_specs = [
             # Slack variables
-            ("fmip", slice(43, 52), GREEN),
-            ("fmip", slice(77, 86), GREEN),
-            ("omip", slice(36, 45), GREEN),
-            ("omip", slice(101, 110), GREEN),
+            ("fmip", "slack", GREEN),
+            ("fmip", "slack-bounds", GREEN),
+            ("omip", "slack", GREEN),
+            ("omip", "slack-bounds", GREEN),
 
             # Variable fixing
-            ("fmip", slice(54, 64), BLUE),
-            ("omip", slice(78, 88), BLUE),
+            ("fmip", "fixing", BLUE),
+            ("omip", "fixing", BLUE),
         ]
 
         boxes = VGroup()
-        for key, span, color in box_specs:
-            mobj = self.eq_dic[key][0][span]
+        for key, part, color in box_specs:
+            mobj = self.eq_dic[key].part(part)
             box = SurroundingRectangle(mobj, color=color)
             boxes.add(box)
             self.play(Create(box))
@@ -190,6 +219,12 @@ class ACS(Scene):
         title = make_title("ACS steps")
         self.play(Write(title))
 
+        # Take the slices once: every new slice is a new group added to the
+        # scene, which would make each iteration of the loop below differ
+        # and prevent manim from reusing the plays it already rendered.
+        omip_fixed = self.eq_dic["omip"].part("infeasibility-bound", "fixing")
+        fmip_fixed = self.eq_dic["fmip"].part("fixing")
+
         # Describe steps of the algorithm.
         steps = VGroup(
             Tex(r"\textbf{For each iteration:}", font_size=25),
@@ -232,7 +267,7 @@ class ACS(Scene):
         self.play(
             steps[2].animate.set_color(GREEN),
             fmip_sol.animate.set_color(GREEN),
-            self.eq_dic["omip"][0][62:88].animate.set_color(GREEN),
+            omip_fixed.animate.set_color(GREEN),
             fmip_arrow.animate.set_color(GREEN),
             run_time=2
         )
@@ -265,7 +300,7 @@ class ACS(Scene):
         self.play(
             steps[4].animate.set_color(BLUE),
             omip_sol.animate.set_color(BLUE),
-            self.eq_dic["fmip"][0][54:64].animate.set_color(BLUE),
+            fmip_fixed.animate.set_color(BLUE),
             omip_arrow.animate.set_color(BLUE),
             run_time=2
         )
@@ -284,7 +319,7 @@ class ACS(Scene):
                 Indicate(steps[2], color=YELLOW),
                 Indicate(fmip_arrow),
                 Indicate(fmip_sol),
-                Indicate(self.eq_dic["omip"][0][62:88]),
+                Indicate(omip_fixed),
             )
 
             # Step 3
@@ -298,7 +333,7 @@ class ACS(Scene):
                 Indicate(steps[4], color=YELLOW),
                 Indicate(omip_arrow),
                 Indicate(omip_sol),
-                Indicate(self.eq_dic["fmip"][0][54:64])
+                Indicate(fmip_fixed)
             )
 
         # Fade out arrows and solutions.
@@ -312,8 +347,8 @@ class ACS(Scene):
 
         # Restore colors.
         self.play(
-            self.eq_dic["omip"][0][62:88].animate.set_color(WHITE),
-            self.eq_dic["fmip"][0][54:64].animate.set_color(WHITE)
+            omip_fixed.animate.set_color(WHITE),
+            fmip_fixed.animate.set_color(WHITE)
         )
 
         # Fade out steps. 
@@ -388,13 +423,15 @@ class ACS(Scene):
 
         # Transform the omip.
         omip_cons = VGroup(
-            self.eq_dic["omip"][0][35:45],
-            self.eq_dic["omip"][0][62:78]
+            self.eq_dic["omip"].part("slack-term"),
+            self.eq_dic["omip"].part("infeasibility-bound"),
         )
         self.play(FadeOut(omip_cons))
 
         self.play( # Move the "= b" to get "Ax = b".
-            self.eq_dic["omip"][0][45:47].animate.next_to(self.eq_dic["omip"][0][34]),
+            self.eq_dic["omip"].part("rhs").animate.next_to(
+                self.eq_dic["omip"].part("Ax")[-1]
+            ),
             run_time=1.5
         )
 
@@ -411,8 +448,8 @@ class ACS(Scene):
 
         omip_deltas = VGroup(
             zero,
-            self.eq_dic["omip"][0][47:62],
-            self.eq_dic["omip"][0][101:110],
+            self.eq_dic["omip"].part("infeasibility"),
+            self.eq_dic["omip"].part("slack-bounds"),
         )
         self.play(Indicate(omip_deltas))
         self.wait(1.5)
@@ -454,3 +491,78 @@ class ACS(Scene):
         descriptions[3].next_to(descriptions[0], DOWN)
         self.play(Write(descriptions[3]))
         self.wait(5)
+
+        # Run ACS on a small instance.
+        self.play(FadeOut(*(mob for mob in self.mobjects if mob is not title)))
+        self.plot_convergence(title)
+
+
+    def plot_convergence(self, title):
+        # Plot the trace of the solver, usually started with the scene.
+        if self.solver is None and config.dry_run:
+            self.solver = acs_solver.BackgroundSolve.finished()
+        elif self.solver is None:
+            self.solver = acs_solver.BackgroundSolve()
+        solver = self.solver
+        start = solver.get(0)
+        if start is None:
+            raise RuntimeError("the ACS solver exited without any result")
+        y_max = start[0]
+
+        axes = Axes(
+            x_range=[0, acs_solver.MAX_ITERATIONS, 5],
+            y_range=[0, y_max, max(1, y_max // 4)],
+            x_length=7,
+            y_length=3.5,
+            tips=False,
+            axis_config={"include_numbers": True, "font_size": 20},
+        ).next_to(title, DOWN, buff=0.8)
+        labels = axes.get_axis_labels(
+            Tex("Iteration", font_size=25),
+            MathTex(r"\sum_{i=0}^{m-1} \hat \Delta_i^+ + \hat \Delta_i^-", font_size=25),
+        )
+        self.play(Create(axes), Write(labels))
+
+        # The tracker goes from one iteration to the next, the curve is
+        # drawn up to it.
+        tracker = ValueTracker(0)
+
+        def trace_curve():
+            t = tracker.get_value()
+            count = int(t)
+            points = [
+                axes.c2p(i, solver.points[i][0]) for i in range(count + 1)
+            ]
+            if t > count:
+                next_point = axes.c2p(count + 1, solver.points[count + 1][0])
+                points.append(interpolate(points[-1], next_point, t - count))
+            curve = VMobject(color=YELLOW, stroke_width=3)
+            if len(points) > 1:
+                curve.set_points_as_corners(points)
+            return curve
+
+        curve = always_redraw(trace_curve)
+        objective = VGroup(
+            MathTex(r"c^Tx =", font_size=30),
+            DecimalNumber(solver.points[0][1], num_decimal_places=0, font_size=30),
+        ).arrange(RIGHT).next_to(axes, RIGHT).align_to(axes, UP)
+        objective[1].add_updater(
+            lambda number: number.set_value(
+                solver.points[round(tracker.get_value())][1]
+            )
+        )
+        self.add(curve)
+        self.play(Write(objective))
+
+        # Waits for the solver only when the next point is not there yet.
+        index = 1
+        while solver.get(index) is not None:
+            self.play(
+                tracker.animate.set_value(index), run_time=0.5, rate_func=linear
+            )
+            index += 1
+        self.wait(3)
+
+        # The plot stays as it is from now on.
+        curve.clear_updaters()
+        objective[1].clear_updaters()
@@ -1,26 +1,34 @@
 from manim import *
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from common import tex_cache
+from common.assets import AssetRegistry
+from common.mobjects import DashedPolyline, InstancedNodes, LineBundle
+from common.network import LayerSpec, NetworkDiagram
+from common.sections import SectionScene
+
+# Share the compiled LaTeX between renders.
+tex_cache.install()
 
 ### GLOBAL VARS ###
-curr_path = "./curr.png"
-prev_path = "./prev.png"
-non_mono_path = "./non_mono.png"
+curr_path = "curr.png"
+prev_path = "prev.png"
+non_mono_path = "non_mono.png"
 
-# Load images.
-prev = ImageMobject(prev_path, invert=True).scale(0.3)
-curr = ImageMobject(curr_path, invert=True).scale(0.3)
-non_mono = ImageMobject(non_mono_path, invert=True).scale(0.3)
+# Images are loaded the first time they are used.
+assets = AssetRegistry(Path(__file__).resolve().parent)
 
 ### Helper functions ###
+def load_image(path):
+    return assets.image(path, invert=True).scale(0.3)
+
 def create_circ(fill_opacity=0.5):
     return Circle(radius=0.05, stroke_width=1.5, color=WHITE, fill_color=WHITE, fill_opacity=fill_opacity)
 
-def stack_circles(start_circle, count, shift=DOWN * 0.3):
-    circles = VGroup(start_circle)
-    for _ in range(count - 1):
-        new_circ = create_circ()
-        new_circ.move_to(circles[-1]).shift(shift)
-        circles.add(new_circ)
-    return circles
+def create_node_column(count, shift=DOWN * 0.3):
+    return InstancedNodes(create_circ(), np.arange(count)[:, None] * shift)
 
 
 def create_rect(color):
@@ -41,23 +49,17 @@ def create_4_elbows_line(start, shift1, shift2, shift3, shift4, end):
     p4 = p3    + shift4
     line = VGroup(
         create_circ(fill_opacity=1).move_to(start), # Little circle con the start.
-        DashedLine(start, p1, stroke_width=1),
-        DashedLine(p1, p2, stroke_width=1),
-        DashedLine(p2, p3, stroke_width=1),
-        DashedLine(p3, p4, stroke_width=1),
-        DashedLine(p4, end, stroke_width=1)
+        DashedPolyline([start, p1, p2, p3, p4, end], stroke_width=1),
     )
     return line
 
 
 ## Scene Class ###
-class MidiNet(Scene):
+class MidiNet(SectionScene):
 
-    def construct(self):
-        self.generator()
-        self.play(FadeOut(*self.mobjects))
-        self.clear()
-        self.discriminator()
+    sections = ("generator", "discriminator")
+
+    def end_section(self, name):
         self.play(FadeOut(*self.mobjects))
         self.clear()
 
@@ -70,6 +72,7 @@ class MidiNet(Scene):
 
         ### CONDITIONER ###
         # Input.
+        prev = load_image(prev_path)
         prev.next_to(title, DOWN).shift(DOWN * 1.5 + LEFT * 6)
         prev_desc = VGroup(
             Tex("Previous melody bar", font_size=15).next_to(prev, UP * 0.5),
@@ -84,96 +87,37 @@ class MidiNet(Scene):
         )
         self.wait(2)
 
-        # Layer 1.
-        cond_layer1 = VGroup()
-        cond_layer1.add(rect for rect in stack_blocks(create_rect(BLUE), 3))
-
-        cond_layer1.scale(0.2)
-        for mob in cond_layer1:
-            mob.stretch_to_fit_width(mob.width + 0.9)
-
-        cond_layer1.next_to(prev).shift(RIGHT * 0.5)
-
-        # Layer 2.
-        cond_layer2 = cond_layer1.copy()
-
-        for mob in cond_layer2:
-            mob.stretch_to_fit_width(mob.width - 0.3)
-
-        cond_layer2.next_to(cond_layer1, RIGHT).shift(RIGHT * 1.5)
-
-        # Layer 3.
-        cond_layer3 = cond_layer1.copy()
-
-        for mob in cond_layer3:
-            mob.stretch_to_fit_width(mob.width - 0.6)
-
-        cond_layer3.next_to(cond_layer2, RIGHT).shift(RIGHT * 1.5)
-
-        # Layer 4.
-        cond_layer4 = cond_layer1.copy()
-
-        for mob in cond_layer4:
-            mob.stretch_to_fit_width(mob.width - 0.9)
-
-        cond_layer4.next_to(cond_layer3, RIGHT).shift(RIGHT * 1.5)
+        # Convolutions.
+        conditioner = NetworkDiagram([
+            LayerSpec("Conv2D", r"[a \times 1 \times 16]", width=1.0,
+                      activation="BN + LReLU"),
+            LayerSpec("Conv2D", r"[a \times 1 \times 8]", width=0.7,
+                      activation="BN + LReLU"),
+            LayerSpec("Conv2D", r"[a \times 1 \times 4]", width=0.4,
+                      activation="BN + LReLU"),
+            LayerSpec("Conv2D", r"[a \times 1 \times 2]", width=0.1,
+                      activation="BN + LReLU"),
+        ])
+        conditioner.shift(
+            prev.get_right() + RIGHT * 0.75 - conditioner.layers.get_left()
+        )
 
         self.play(
-            (Create(mob) for mob in reversed(cond_layer1)),
-            (Create(mob) for mob in reversed(cond_layer2)),
-            (Create(mob) for mob in reversed(cond_layer3)),
-            (Create(mob) for mob in reversed(cond_layer4)),
+            Create(block)
+            for layer in conditioner.layers
+            for block in reversed(layer)
         )
         self.wait(1)
 
-
         # Layers descriptions.
-        cond_layers_desc = VGroup(
-            Tex(r"Conv2D\\$[a \times 1 \times 16]$", font_size=15).next_to(cond_layer1.get_bottom()).shift(DOWN * 0.3 + LEFT * 0.5),
-            Tex(r"Conv2D\\$[a\times 1\times 8]$", font_size=15).next_to(cond_layer2.get_bottom()).shift(DOWN * 0.3 + LEFT * 0.5),
-            Tex(r"Conv2D\\$[a\times 1 \times 4]$", font_size=15).next_to(cond_layer3.get_bottom()).shift(DOWN * 0.3 + LEFT * 0.5),
-            Tex(r"Conv2D\\$[a \times 1 \times 2]$", font_size=15).next_to(cond_layer4.get_bottom()).shift(DOWN * 0.3 + LEFT * 0.5)
-        )
-        self.play(Write(cond_layers_desc))
+        self.play(Write(conditioner.descriptions))
         self.wait(2)
 
         # Crate arrow between convolution.
-        cond_arrows = VGroup(
-                Arrow(
-                    start=cond_layer1.get_right(),
-                    end=cond_layer2.get_left(),
-                    stroke_width=0.7,
-                    tip_length=0.1,
-                ),
-                Arrow(
-                    start=cond_layer2.get_right(),
-                    end=cond_layer3.get_left(),
-                    stroke_width=0.7,
-                    tip_length=0.1,
-                ),
-                Arrow(
-                    start=cond_layer3.get_right(),
-                    end=cond_layer4.get_left(),
-                    stroke_width=0.7,
-                    tip_length=0.1,
-                ),
-                Arrow(
-                    start=cond_layer4.get_right(),
-                    end=cond_layer4.get_right() + RIGHT,
-                    stroke_width=0.7,
-                    tip_length=0.1,
-                ),
-        )
-        self.play(FadeIn(cond_arrows))
+        self.play(FadeIn(conditioner.arrows))
 
         # BN + LeakyReLU descriptions.
-        self.play(
-            Write(
-                Tex(r"\texttt{BN + LReLU}", font_size=12)
-                .next_to(arrow, UP).shift(DOWN * 0.2)
-            )
-            for arrow in cond_arrows
-        )
+        self.play(Write(label) for label in conditioner.activations)
         self.wait(2)
 
 
@@ -204,32 +148,23 @@ class MidiNet(Scene):
 
 
         # fully-connected 1.
-        full1 = VGroup()
-        f1_start = create_circ()
-        full1.add(circ for circ in stack_circles(f1_start, 5))
+        full1 = create_node_column(5)
 
         full1.next_to(noise).shift(RIGHT * 0.3)
         self.play(Create(full1))
 
         # fully-connected 2.
-        full2 = VGroup()
-        f2_start = create_circ()
-        full2.add(circ for circ in stack_circles(f2_start, 3))
+        full2 = create_node_column(3)
 
         full2.next_to(full1).shift(RIGHT * 0.2)
         self.play(Create(full2))
 
         # Fully connected layer arrows.
-        full_arrows = VGroup()
-
-        for f1 in full1:
-            for f2 in full2:
-                arrow = Line(
-                    start=f1.get_right(),
-                    end=f2.get_left(),
-                    stroke_width=0.5,
-                )
-                full_arrows.add(arrow)
+        full_arrows = LineBundle(
+            full1.get_critical_points(RIGHT),
+            full2.get_critical_points(LEFT),
+            stroke_width=0.5,
+        )
 
         # Fully connected descriptions.
         fully_desc = VGroup(
@@ -304,6 +239,7 @@ class MidiNet(Scene):
         self.wait(2)
 
         # Net output.
+        non_mono = load_image(non_mono_path)
         non_mono.next_to(layer4).shift(RIGHT)
         non_mono_desc = VGroup(
             Tex(r"Non-monophonic\\output", font_size=15).next_to(non_mono, UP * 0.5),
@@ -311,7 +247,7 @@ class MidiNet(Scene):
         )
 
         # Fake sample.
-        fake = curr
+        fake = load_image(curr_path)
         fake.next_to(non_mono).shift(RIGHT * 1.5)
         fake_desc = VGroup(
             Tex(r"Current (fake)\\melody bar", font_size=15).next_to(fake, UP * 0.5),
@@ -382,7 +318,7 @@ class MidiNet(Scene):
         ### CONNECTIONS ###
         dotted_lines = VGroup(
             create_4_elbows_line(
-                start=cond_arrows[3].get_top() + UP * 0.2,
+                start=conditioner.arrows[3].get_top() + UP * 0.2,
                 end=layer1[-1].get_top(),
                 shift1=UP * 0.2,
                 shift2=RIGHT,
@@ -390,7 +326,7 @@ class MidiNet(Scene):
                 shift4=LEFT * 8.9
             ),
             create_4_elbows_line(
-                start=cond_arrows[2].get_top() + UP * 0.2,
+                start=conditioner.arrows[2].get_top() + UP * 0.2,
                 end=layer2[-1].get_top(),
                 shift1=UP * 0.3,
                 shift2=RIGHT * 3,
@@ -398,7 +334,7 @@ class MidiNet(Scene):
                 shift4=LEFT * 8.3
             ),
             create_4_elbows_line(
-                start=cond_arrows[1].get_top() + UP * 0.2,
+                start=conditioner.arrows[1].get_top() + UP * 0.2,
                 end=layer3[-1].get_top(),
                 shift1=UP * 0.4,
                 shift2=RIGHT * 5.7,
@@ -406,7 +342,7 @@ class MidiNet(Scene):
                 shift4=LEFT * 7
             ),
             create_4_elbows_line(
-                start=cond_arrows[0].get_top() + UP * 0.2,
+                start=conditioner.arrows[0].get_top() + UP * 0.2,
                 end=layer4[-1].get_top(),
                 shift1=UP * 0.5,
                 shift2=RIGHT * 8.7,
@@ -422,6 +358,7 @@ class MidiNet(Scene):
         self.play(Write(title))
 
         # Input.
+        curr = load_image(curr_path)
         input = Group(
             curr.next_to(title, DOWN).shift(LEFT * 3.8 + DOWN * 2),
         )
@@ -492,17 +429,13 @@ class MidiNet(Scene):
         self.wait(2)
 
         # fully-connected 1.
-        full1 = VGroup()
-        f1_start = create_circ()
-        full1.add(circ for circ in stack_circles(f1_start, 3))
+        full1 = create_node_column(3)
 
         full1.next_to(layer2, RIGHT).shift(RIGHT * 1.5)
         self.play(Create(full1))
 
         # fully-connected 2.
-        full2 = VGroup()
-        f2_start = create_circ()
-        full2.add(circ for circ in stack_circles(f2_start, 5))
+        full2 = create_node_column(5)
 
         full2.next_to(full1).shift(RIGHT * 0.2)
         self.play(Create(full2))
@@ -514,22 +447,19 @@ class MidiNet(Scene):
         self.play(Create(full3))
 
         # Fully connected layer arrows.
-        full_arrows = VGroup()
-
-        for f1 in full1:
-            for f2 in full2:
-                arrow1 = Line(
-                    start=f1.get_right(),
-                    end=f2.get_left(),
-                    stroke_width=0.5,
-                )
-                arrow2 = Line(
-                    start=f2.get_right(),
-                    end=full3,
-                    stroke_width=0.5,
-                )
-                full_arrows.add(arrow1, arrow2)
-
+        full_arrows = VGroup(
+            LineBundle(
+                full1.get_critical_points(RIGHT),
+                full2.get_critical_points(LEFT),
+                stroke_width=0.5,
+            ),
+            LineBundle(
+                full2.get_critical_points(RIGHT),
+                full3.get_center(),
+                end_radius=full3.width / 2,
+                stroke_width=0.5,
+            ),
+        )
 
         # Fully connected descriptions.
         fully_desc = VGroup(
@@ -0,0 +1 @@
+"""Helpers shared by the scenes of this repository."""
@@ -0,0 +1,98 @@
+"""Images loaded on first use and shared between mobjects.
+
+The decoded RGBA pixels of every image are stored once, as ``.npy`` files in
+a cache directory, and memory-mapped read-only. The mobjects built from an
+image view those pixels and only copy them when they change them.
+"""
+
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+from manim import DEFAULT_QUALITY, QUALITIES, ImageMobject
+from manim.mobject.types.image_mobject import AbstractImageMobject
+
+CACHE_ENV = "MANIM_ASSET_CACHE"
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "manim-projects" / "assets"
+
+
+class SharedImageMobject(ImageMobject):
+    """``ImageMobject`` viewing a read-only RGBA array shared with others."""
+
+    def __init__(
+        self,
+        pixel_array,
+        scale_to_resolution=QUALITIES[DEFAULT_QUALITY]["pixel_height"],
+        **kwargs,
+    ):
+        # Every attribute ImageMobject.__init__ sets, without copying pixels.
+        self.fill_opacity = 1
+        self.stroke_opacity = 1
+        self.invert_image = False
+        self.image_mode = "RGBA"
+        self.pixel_array_dtype = "uint8"
+        self.pixel_array = pixel_array
+        self.orig_alpha_pixel_array = pixel_array[:, :, 3]
+        AbstractImageMobject.__init__(self, scale_to_resolution, **kwargs)
+
+    def __deepcopy__(self, memo):
+        # Copies share the pixels as long as they are read-only.
+        if not self.pixel_array.flags.writeable:
+            memo[id(self.pixel_array)] = self.pixel_array
+            memo[id(self.orig_alpha_pixel_array)] = self.orig_alpha_pixel_array
+        return super().__deepcopy__(memo)
+
+    def _own_pixels(self):
+        if not self.pixel_array.flags.writeable:
+            self.pixel_array = np.array(self.pixel_array)
+
+    def set_color(self, color, alpha=None, family=True):
+        self._own_pixels()
+        return super().set_color(color, alpha, family)
+
+    def set_opacity(self, alpha):
+        self._own_pixels()
+        return super().set_opacity(alpha)
+
+
+class AssetRegistry:
+    """Images of the directory ``root``, decoded once and cached on disk."""
+
+    def __init__(self, root, cache_dir=None):
+        self.root = Path(root)
+        self.cache_dir = Path(
+            cache_dir or os.environ.get(CACHE_ENV) or DEFAULT_CACHE_DIR
+        )
+        self._pixels = {}
+
+    def pixels(self, name, invert=False):
+        """Read-only RGBA pixels of the image ``name``."""
+        key = (name, invert)
+        if key not in self._pixels:
+            self._pixels[key] = self._load(self.root / name, invert)
+        return self._pixels[key]
+
+    def image(self, name, invert=False, **kwargs):
+        """New mobject showing the image ``name``."""
+        return SharedImageMobject(self.pixels(name, invert), **kwargs)
+
+    def _load(self, path, invert):
+        stat = path.stat()
+        key = f"{path.resolve()}:{stat.st_size}:{stat.st_mtime_ns}:{invert}"
+        cached = self.cache_dir / f"{hashlib.sha256(key.encode()).hexdigest()}.npy"
+
+        if not cached.exists():
+            pixels = np.array(Image.open(path).convert("RGBA"))
+            if invert:
+                pixels[:, :, :3] = 255 - pixels[:, :, :3]
+
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, pixels)
+            os.replace(tmp, cached)
+
+        return np.load(cached, mmap_mode="r")
@@ -0,0 +1,124 @@
+"""Snapshots of the state of a scene, to resume a render from them.
+
+A snapshot is made of a pickled skeleton of the mobject tree where every
+NumPy array is replaced by a reference into one contiguous buffer per
+dtype. Loading it reads a handful of buffers and unpickles small Python
+objects, the point arrays are views into the buffers.
+"""
+
+import inspect
+import io
+import os
+import pickle
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from common.env import CHECKPOINT_ENV
+from common.scripts import files_digest, module_files
+
+
+class _Pickler(pickle.Pickler):
+
+    def __init__(self, file):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.buffers = {}
+        self.sizes = {}
+
+    def persistent_id(self, obj):
+        if type(obj) is not np.ndarray or obj.dtype.hasobject:
+            return None
+        dtype = obj.dtype.name
+        offset = self.sizes.get(dtype, 0)
+        self.buffers.setdefault(dtype, []).append(obj.ravel())
+        self.sizes[dtype] = offset + obj.size
+        return (dtype, offset, obj.shape)
+
+
+class _Unpickler(pickle.Unpickler):
+
+    def __init__(self, file, buffers):
+        super().__init__(file)
+        self.buffers = buffers
+
+    def persistent_load(self, pid):
+        dtype, offset, shape = pid
+        size = int(np.prod(shape))
+        return self.buffers[dtype][offset:offset + size].reshape(shape)
+
+
+def dumps(state):
+    """Return the snapshot of ``state`` as bytes."""
+    skeleton = io.BytesIO()
+    pickler = _Pickler(skeleton)
+    pickler.dump(state)
+
+    arrays = {
+        f"buffer{dtype}": np.concatenate(arrays)
+        for dtype, arrays in pickler.buffers.items()
+    }
+    data = io.BytesIO()
+    np.savez(
+        data,
+        skeleton=np.frombuffer(skeleton.getbuffer(), dtype=np.uint8),
+        **arrays,
+    )
+    return data.getvalue()
+
+
+def loads(data):
+    """Return the state stored in the snapshot ``data``."""
+    with np.load(io.BytesIO(data)) as archive:
+        buffers = {
+            name[len("buffer"):]: archive[name]
+            for name in archive.files if name.startswith("buffer")
+        }
+        skeleton = archive["skeleton"].tobytes()
+    return _Unpickler(io.BytesIO(skeleton), buffers).load()
+
+
+def scene_key(scene):
+    """Hash of the script defining ``scene`` and of the modules it can
+    import, snapshots of other versions of them are not loaded."""
+    script = inspect.getfile(type(scene))
+    return files_digest([script, *module_files(script)])[:16]
+
+
+def checkpoint_path(scene, section, directory=None):
+    """Path of the snapshot taken at the end of ``section``, or ``None``
+    when ``SCENE_CHECKPOINT_DIR`` is not set."""
+    directory = directory or os.environ.get(CHECKPOINT_ENV)
+    if not directory:
+        return None
+    return Path(directory) / (
+        f"{type(scene).__name__}-{section}-{scene_key(scene)}.npz"
+    )
+
+
+def save(scene, path):
+    """Write the mobjects of ``scene`` and its ``checkpoint_attrs``."""
+    state = {
+        "mobjects": scene.mobjects,
+        "foreground_mobjects": scene.foreground_mobjects,
+        "attrs": {
+            name: getattr(scene, name) for name in scene.checkpoint_attrs
+        },
+    }
+    data = dumps(state)
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def load(scene, path):
+    """Restore the state written by ``save`` in ``scene``."""
+    state = loads(Path(path).read_bytes())
+    scene.mobjects = state["mobjects"]
+    scene.foreground_mobjects = state["foreground_mobjects"]
+    for name, value in state["attrs"].items():
+        setattr(scene, name, value)
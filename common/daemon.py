@@ -0,0 +1,100 @@
+"""Render server that keeps manim and the scene scripts imported.
+
+The server loads manim and the scripts once, then forks a child for every
+job, so a render starts with everything already imported and the server
+state is never touched by a scene. Jobs and replies are JSON lines on a
+Unix socket, e.g.::
+
+    {"script": "MidiNetStructure/main.py", "scene": "MidiNet",
+     "section": "generator", "quality": "l"}
+"""
+
+import json
+import os
+import socket
+import socketserver
+import tempfile
+from pathlib import Path
+
+from common.env import SECTION_ENV
+from common.scripts import load_module, script_dir
+
+DEFAULT_SOCKET = Path(
+    os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+) / f"manim-render-{os.getuid()}.sock"
+
+QUALITIES = {
+    "l": "low_quality",
+    "m": "medium_quality",
+    "h": "high_quality",
+    "p": "production_quality",
+    "k": "fourk_quality",
+}
+
+
+class _Handler(socketserver.StreamRequestHandler):
+
+    def handle(self):
+        try:
+            job = json.loads(self.rfile.readline())
+            reply = {"ok": True, "output": str(self.server.render(job))}
+        except Exception as exc:
+            reply = {"ok": False, "error": f"{type(exc).__name__}: {exc}"}
+        self.wfile.write(json.dumps(reply).encode() + b"\n")
+
+
+class RenderServer(socketserver.ForkingMixIn, socketserver.UnixStreamServer):
+    """Unix socket server rendering scenes from preloaded scripts."""
+
+    def __init__(self, scripts, socket_path=DEFAULT_SOCKET):
+        self.modules = {}
+        for script in scripts:
+            self.load(script)
+
+        socket_path = Path(socket_path)
+        socket_path.unlink(missing_ok=True)
+        super().__init__(str(socket_path), _Handler)
+
+    def load(self, script):
+        script = Path(script).resolve()
+        self.modules[script] = (script.stat().st_mtime, load_module(script))
+
+    def process_request(self, request, client_address):
+        # Reload the edited scripts in the server, before forking, so the
+        # following jobs get them warm too.
+        for script, (mtime, _) in list(self.modules.items()):
+            if script.stat().st_mtime != mtime:
+                self.load(script)
+        super().process_request(request, client_address)
+
+    def render(self, job):
+        """Render ``job`` and return the path of the video."""
+        # Imported here so that submitting a job does not import manim.
+        from manim import tempconfig
+
+        script = Path(job["script"]).resolve()
+        if script not in self.modules:
+            self.load(script)
+        scene_class = getattr(self.modules[script][1], job["scene"])
+
+        if job.get("section"):
+            os.environ[SECTION_ENV] = job["section"]
+        else:
+            os.environ.pop(SECTION_ENV, None)
+
+        options = {"quality": QUALITIES[job.get("quality", "l")]}
+        if job.get("output"):
+            options["output_file"] = job["output"]
+        with script_dir(script), tempconfig(options):
+            scene = scene_class()
+            scene.render()
+            return Path(scene.renderer.file_writer.movie_file_path).resolve()
+
+
+def submit(job, socket_path=DEFAULT_SOCKET):
+    """Send ``job`` to a running server and return its reply."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(str(socket_path))
+        sock.sendall(json.dumps(job).encode() + b"\n")
+        with sock.makefile("rb") as reply:
+            return json.loads(reply.readline())
@@ -0,0 +1,43 @@
+"""Environment variables used to configure the scenes from the outside.
+
+They are kept apart from the scene helpers so the tools driving the renders
+can use them without importing manim.
+"""
+
+from pathlib import Path
+
+# Name of the only section of a ``SectionScene`` to render.
+SECTION_ENV = "SCENE_SECTION"
+
+# Number of bands a frame is split into and rasterized in parallel.
+TILES_ENV = "SCENE_TILES"
+
+# "k/n": render only the k-th of n equal parts of the frames of every play.
+SHARD_ENV = "SCENE_SHARD"
+
+# File the number of frames of every rendered play is written to, without
+# rendering them.
+FRAMES_ENV = "SCENE_FRAMES"
+
+# Directory of the scene snapshots taken at the end of every section.
+CHECKPOINT_ENV = "SCENE_CHECKPOINT_DIR"
+
+# Path of the Chrome trace of the render, see ``common.profiling`` and
+# ``trace_path``.
+TRACE_ENV = "SCENE_TRACE"
+
+# Number of frames that can wait for manim's writer thread to encode them,
+# 0 for no bound.
+STREAM_ENV = "SCENE_STREAM_FRAMES"
+
+
+def trace_path(trace, section=None):
+    """File the trace of a render is written to, given ``SCENE_TRACE``.
+
+    The renders of single sections, which can run side by side, write to
+    ``trace`` with the name of their section added, e.g. ``trace-intro.json``.
+    """
+    trace = Path(trace)
+    if not section:
+        return trace
+    return trace.with_name(f"{trace.stem}-{section}{trace.suffix}")
@@ -0,0 +1,200 @@
+"""Interpolate many simultaneous transforms in a single NumPy pass.
+
+Every ``Transform`` (``FadeOut``, ``Indicate``, ...) moves each of its
+submobjects from a starting copy to a target copy, one ``interpolate`` call
+per submobject and per frame. ``FusedTransforms`` gathers the points and
+colors of all of them in a few arrays, the mobjects being views into those
+arrays, and updates them all at once.
+
+A ``FusedTransforms`` has no mobject of its own, so fusing a play does not
+change what is on screen: the scene adds the mobjects of its transforms,
+listed by ``expand``, as it would have without fusing.
+"""
+
+import numpy as np
+from manim import Animation, Transform, VMobject, linear
+from manim.utils.bezier import interpolate
+
+# Arrays interpolated in bulk, one row per point or color.
+ARRAY_ATTRS = (
+    "points",
+    "fill_rgbas",
+    "stroke_rgbas",
+    "background_stroke_rgbas",
+)
+# Style interpolated one mobject at a time, when it changes.
+SCALAR_ATTRS = (
+    "stroke_width",
+    "background_stroke_width",
+    "sheen_factor",
+    "sheen_direction",
+)
+
+
+def can_fuse(animation):
+    """Whether ``animation`` only moves its mobjects along straight lines
+    between two states of the same shape."""
+    if not isinstance(animation, Transform):
+        return False
+    # Arcs and subclasses overriding the interpolation do something else.
+    cls = type(animation)
+    return (
+        animation.path_func is interpolate
+        and cls.interpolate_mobject is Transform.interpolate_mobject
+        and cls.interpolate_submobject is Transform.interpolate_submobject
+    )
+
+
+class FusedTransforms(Animation):
+    """Transforms of the same run time interpolated together."""
+
+    def __init__(self, *animations, **kwargs):
+        self.animations = list(animations)
+        # Marked as an introducer so the scene does not add its placeholder
+        # mobject, the mobjects of the transforms are added instead.
+        super().__init__(
+            None,
+            run_time=max(animation.run_time for animation in animations),
+            rate_func=linear,
+            introducer=True,
+            **kwargs,
+        )
+
+    def _setup_scene(self, scene):
+        for animation in self.animations:
+            animation._setup_scene(scene)
+
+    def begin(self):
+        for animation in self.animations:
+            animation.begin()
+
+        self.fused = []  # Animations interpolated in bulk.
+        self.separate = []  # Animations that did not fit after all.
+        triples = []
+        for animation in self.animations:
+            families = list(animation.get_all_families_zipped())
+            if all(self._fits(*mobs) for mobs in families):
+                self.fused.append((animation, len(triples), len(families)))
+                triples.extend(families)
+            else:
+                self.separate.append(animation)
+
+        # The animations sharing a rate function and without lag get the
+        # same alpha, computed once.
+        self.uniform = {}
+        self.lagged = []
+        for animation, start, count in self.fused:
+            if animation.lag_ratio == 0:
+                self.uniform.setdefault(animation.rate_func, []).extend(
+                    range(start, start + count)
+                )
+            else:
+                self.lagged.append((animation, start, count))
+        self.uniform = [
+            (rate_func, np.array(rows))
+            for rate_func, rows in self.uniform.items()
+        ]
+        self.alphas = np.zeros(len(triples))
+
+        self.buffers = []
+        for attr in ARRAY_ATTRS:
+            starts = [getattr(start, attr) for _, start, _ in triples]
+            targets = [getattr(target, attr) for _, _, target in triples]
+            lengths = [len(array) for array in starts]
+            if not sum(lengths):
+                continue
+            start = np.concatenate(starts)
+            delta = np.concatenate(targets) - start
+            current = start.copy()
+            offset = 0
+            for (mob, _, _), length in zip(triples, lengths):
+                setattr(mob, attr, current[offset:offset + length])
+                offset += length
+            owners = np.repeat(np.arange(len(triples)), lengths)
+            self.buffers.append((current, start, delta, owners))
+
+        self.loose = [
+            (index, attr)
+            for index, (_, start, target) in enumerate(triples)
+            for attr in SCALAR_ATTRS
+            if not np.array_equal(getattr(start, attr), getattr(target, attr))
+        ]
+        self.triples = triples
+
+    @staticmethod
+    def _fits(mob, start, target):
+        if not all(isinstance(m, VMobject) for m in (mob, start, target)):
+            return False
+        return all(
+            np.shape(getattr(mob, attr))
+            == np.shape(getattr(start, attr))
+            == np.shape(getattr(target, attr))
+            for attr in ARRAY_ATTRS
+        )
+
+    def update_mobjects(self, dt):
+        for animation in self.animations:
+            animation.update_mobjects(dt)
+
+    def finish(self):
+        # The transforms set their final state in arrays of their own, the
+        # buffers are not kept alive by the mobjects.
+        for animation in self.animations:
+            animation.finish()
+
+    def clean_up_from_scene(self, scene):
+        for animation in self.animations:
+            animation.clean_up_from_scene(scene)
+
+    def interpolate(self, alpha):
+        for animation in self.separate:
+            animation.interpolate(alpha)
+
+        for rate_func, rows in self.uniform:
+            self.alphas[rows] = rate_func(alpha)
+        for animation, start, count in self.lagged:
+            for index in range(count):
+                self.alphas[start + index] = animation.get_sub_alpha(
+                    alpha, index, count
+                )
+
+        for current, start, delta, owners in self.buffers:
+            np.multiply(delta, self.alphas[owners][:, None], out=current)
+            current += start
+
+        for index, attr in self.loose:
+            mob, start, target = self.triples[index]
+            setattr(mob, attr, interpolate(
+                getattr(start, attr), getattr(target, attr), self.alphas[index]
+            ))
+
+
+def fuse(animations):
+    """Replace the transforms of ``animations`` sharing a run time by
+    ``FusedTransforms``, when there are several of them.
+
+    A ``FusedTransforms`` takes the place of the first of its transforms.
+    """
+    groups = {}
+    for animation in animations:
+        if can_fuse(animation):
+            groups.setdefault(animation.run_time, []).append(animation)
+
+    fused = []
+    for animation in animations:
+        group = groups.get(animation.run_time) if can_fuse(animation) else None
+        if group is None or len(group) == 1:
+            fused.append(animation)
+        elif animation is group[0]:
+            fused.append(FusedTransforms(*group))
+    return fused
+
+
+def expand(animations):
+    """``animations`` with every ``FusedTransforms`` replaced by its
+    transforms."""
+    for animation in animations:
+        if isinstance(animation, FusedTransforms):
+            yield from animation.animations
+        else:
+            yield animation
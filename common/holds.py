@@ -0,0 +1,54 @@
+"""Encode a static hold as two frames, whatever its length.
+
+A frozen ``wait`` is rasterized once, but manim still converts and encodes
+that frame once per frame of the hold. Here the frames are given explicit
+timestamps: a held frame is encoded at the first and the last timestamp
+of the hold only, and the video shows it in between, so encoding a hold
+takes the same time whatever its duration.
+
+H.264 streams are encoded without B-frames: with them, the decoding
+timestamps libx264 gives the packets ignore the gaps, and the partial movies
+come out shorter than their holds.
+"""
+
+import av
+
+
+def install(file_writer):
+    """Patch ``file_writer`` so held frames are encoded only twice.
+
+    Writers that do not encode through PyAV are left untouched.
+    """
+    encode = getattr(file_writer, "encode_and_write_frame", None)
+    if encode is None:
+        return
+    open_stream = file_writer.open_partial_movie_stream
+    state = {"stream": None, "pts": 0}
+
+    def open_partial_movie_stream(*args, **kwargs):
+        open_stream(*args, **kwargs)
+        codec_context = file_writer.video_stream.codec_context
+        if codec_context.name == "libx264":
+            codec_context.options = {**codec_context.options, "bf": "0"}
+
+    def encode_and_write_frame(frame, num_frames):
+        stream = getattr(file_writer, "video_stream", None)
+        if stream is None:
+            return encode(frame, num_frames)
+
+        # Every partial movie has a stream of its own, starting at 0.
+        if state["stream"] is not stream:
+            state["stream"], state["pts"] = stream, 0
+        start = state["pts"]
+        state["pts"] += num_frames
+
+        # The last frame of the hold is needed for the video to last until
+        # its end.
+        for pts in sorted({start, start + num_frames - 1}):
+            av_frame = av.VideoFrame.from_ndarray(frame, format="rgba")
+            av_frame.pts = pts
+            for packet in stream.encode(av_frame):
+                file_writer.video_container.mux(packet)
+
+    file_writer.open_partial_movie_stream = open_partial_movie_stream
+    file_writer.encode_and_write_frame = encode_and_write_frame
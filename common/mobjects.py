@@ -0,0 +1,172 @@
+"""Mobjects drawing many shapes as a single path."""
+
+import numpy as np
+from manim import DEFAULT_DASH_LENGTH, ORIGIN, ManimColor, VGroup, VMobject
+
+
+def straight_curves(starts, ends):
+    """Points of the segments from ``starts`` to ``ends``, as cubic Bezier
+    curves with their handles on the segment."""
+    alphas = np.linspace(0, 1, 4).reshape(1, 4, 1)
+    curves = starts[:, None] + alphas * (ends - starts)[:, None]
+    return curves.reshape(-1, 3)
+
+
+class LineBundle(VMobject):
+    """Straight lines between two sets of points, stored as one path.
+
+    Every start is joined to every end, as the edges of a fully-connected
+    layer, unless ``complete`` is false, then ``starts[i]`` is joined to
+    ``ends[i]``. With ``end_radius`` the ends are the centers of circles of
+    that radius and the lines stop on their boundary.
+    """
+
+    def __init__(self, starts, ends, complete=True, end_radius=0, **kwargs):
+        starts = np.asarray(starts, dtype=float).reshape(-1, 3)
+        ends = np.asarray(ends, dtype=float).reshape(-1, 3)
+        if complete:
+            starts, ends = (
+                np.repeat(starts, len(ends), axis=0),
+                np.tile(ends, (len(starts), 1)),
+            )
+        if end_radius:
+            directions = ends - starts
+            directions /= np.linalg.norm(directions, axis=1, keepdims=True)
+            ends = ends - end_radius * directions
+
+        self.starts = starts
+        self.ends = ends
+        super().__init__(**kwargs)
+
+    def generate_points(self):
+        self.set_points(straight_curves(self.starts, self.ends))
+
+
+class DashedPolyline(VMobject):
+    """Dashed path through ``vertices``, stored as one path.
+
+    The dash pattern runs along the whole polyline, dashes bend around the
+    corners, and ``Create`` draws the path at constant speed along its
+    length, gaps included.
+    """
+
+    def __init__(self, vertices, dash_length=DEFAULT_DASH_LENGTH,
+                 dashed_ratio=0.5, **kwargs):
+        vertices = np.asarray(vertices, dtype=float).reshape(-1, 3)
+        # Repeated vertices would make the arc length non increasing.
+        keep = np.ones(len(vertices), dtype=bool)
+        keep[1:] = np.any(np.diff(vertices, axis=0) != 0, axis=1)
+        self.vertices = vertices[keep]
+        self.dash_length = dash_length
+        self.dashed_ratio = dashed_ratio
+        super().__init__(**kwargs)
+
+    def generate_points(self):
+        vertices = self.vertices
+        lengths = np.linalg.norm(np.diff(vertices, axis=0), axis=1)
+        distances = np.concatenate([[0], np.cumsum(lengths)])
+        total = distances[-1]
+        period = self.dash_length / self.dashed_ratio
+
+        # Pieces between the dash ends and the corners, the ones in the
+        # middle of a dash are drawn.
+        dash_starts = np.arange(0, total, period)
+        cuts = np.unique(np.concatenate([
+            dash_starts,
+            np.minimum(dash_starts + self.dash_length, total),
+            distances,
+        ]))
+        lows, highs = cuts[:-1], cuts[1:]
+        drawn = ((lows + highs) / 2) % period < self.dash_length
+        lows, highs = lows[drawn], highs[drawn]
+
+        def point_at(distance):
+            return np.stack(
+                [np.interp(distance, distances, vertices[:, k]) for k in range(3)],
+                axis=1,
+            )
+
+        self.set_points(straight_curves(point_at(lows), point_at(highs)))
+
+        # Where each curve starts and ends along the path, in [0, 1].
+        self.curve_bounds = np.stack([lows, highs], axis=1) / max(total, 1e-12)
+
+    def pointwise_become_partial(self, vmobject, a, b):
+        # Turn the proportions of length into proportions of curves.
+        bounds = getattr(vmobject, "curve_bounds", None)
+        if bounds is not None and len(bounds):
+            num_curves = len(bounds)
+            along = np.concatenate([[0], bounds.ravel(), [1]])
+            curves = np.concatenate([
+                [0],
+                np.stack(
+                    [np.arange(num_curves), np.arange(1, num_curves + 1)],
+                    axis=1,
+                ).ravel() / num_curves,
+                [1],
+            ])
+            a, b = np.interp([a, b], along, curves)
+        return super().pointwise_become_partial(vmobject, a, b)
+
+
+class InstancedNodes(VGroup):
+    """Copies of a prototype shape centered on ``positions``.
+
+    The instances with the same fill are stored in a single path, so a
+    layer of any width is one ``VMobject`` unless ``fill_colors`` or
+    ``fill_opacities`` vary per instance. The stroke of every instance is
+    the one of ``prototype``.
+    """
+
+    def __init__(self, prototype, positions, fill_colors=None,
+                 fill_opacities=None, **kwargs):
+        super().__init__(**kwargs)
+        positions = np.asarray(positions, dtype=float).reshape(-1, 3)
+        count = len(positions)
+        shape = prototype.points - prototype.get_center()
+        self.points_per_instance = len(shape)
+
+        if fill_colors is None:
+            fill_colors = [prototype.get_fill_color()] * count
+        if fill_opacities is None:
+            fill_opacities = prototype.get_fill_opacity()
+        fill_opacities = np.broadcast_to(fill_opacities, count)
+
+        styles = {}
+        for index, (color, opacity) in enumerate(
+            zip(map(ManimColor, fill_colors), fill_opacities)
+        ):
+            styles.setdefault((color.to_hex(), float(opacity)), []).append(index)
+
+        for (color, opacity), indices in styles.items():
+            indices = np.array(indices)
+            batch = VMobject().match_style(prototype)
+            batch.set_points(
+                (positions[indices, None] + shape[None]).reshape(-1, 3)
+            )
+            batch.set_fill(color, opacity)
+            batch.instance_indices = indices
+            self.add(batch)
+        self.count = count
+
+    def get_instance_points(self):
+        """Points of every instance, as a ``(count, k, 3)`` array."""
+        points = np.empty((self.count, self.points_per_instance, 3))
+        for batch in self.submobjects:
+            points[batch.instance_indices] = batch.points.reshape(
+                -1, self.points_per_instance, 3
+            )
+        return points
+
+    def get_critical_points(self, direction):
+        """``get_critical_point(direction)`` of every instance."""
+        points = self.get_instance_points()
+        low, high = points.min(axis=1), points.max(axis=1)
+        direction = np.asarray(direction)
+        return np.where(
+            direction > 0, high, np.where(direction < 0, low, (low + high) / 2)
+        )
+
+    def get_positions(self):
+        """Centers of the instances."""
+        return self.get_critical_points(ORIGIN)
@@ -0,0 +1,103 @@
+r"""``MathTex`` whose parts are looked up by name instead of glyph index.
+
+Parts of the LaTeX source are tagged with ``\named{name}{...}``, which
+makes dvisvgm wrap their glyphs in an SVG group. The glyph range of every
+group is read from the compiled SVG once and cached next to it, e.g.::
+
+    eq = NamedMathTex(r"\named{lhs}{Ax} = b")
+    eq.part("lhs")  # The glyphs of "Ax", eq[0][0:2].
+
+Parts cannot span the cells of an alignment, ``part`` accepts several
+names and returns the glyphs from the first to the last of them.
+"""
+
+import copy
+import json
+import os
+import tempfile
+from pathlib import Path
+from xml.etree import ElementTree
+
+from manim import MathTex, VGroup, config
+
+NAMED_MACRO = (
+    r"\newcommand{\named}[2]{"
+    r"\special{dvisvgm:raw <g id='named-#1'>}#2"
+    r"\special{dvisvgm:raw </g>}}"
+)
+PREFIX = "named-"
+
+# Elements manim turns into submobjects, and the ones only referenced.
+DRAWABLE_TAGS = {
+    "use", "path", "rect", "line", "circle", "ellipse", "polygon", "polyline",
+}
+REFERENCED_TAGS = {"defs", "symbol", "clipPath", "mask", "pattern", "marker"}
+
+
+def read_names(svg_file):
+    """Return ``{name: (start, stop)}``, the glyph range of every named
+    group of ``svg_file``."""
+    names = {}
+    count = 0
+
+    def walk(element):
+        nonlocal count
+        tag = element.tag.rpartition("}")[2]
+        if tag in REFERENCED_TAGS:
+            return
+        if tag in DRAWABLE_TAGS:
+            count += 1
+        start = count
+        for child in element:
+            walk(child)
+        name = element.get("id", "")
+        if tag == "g" and name.startswith(PREFIX):
+            names[name[len(PREFIX):]] = (start, count)
+
+    walk(ElementTree.parse(svg_file).getroot())
+    return names
+
+
+def name_index(svg_file):
+    """``read_names`` cached in a JSON file next to ``svg_file``."""
+    svg_file = Path(svg_file)
+    index_file = svg_file.with_suffix(".names.json")
+    try:
+        return {
+            name: tuple(span)
+            for name, span in json.loads(index_file.read_text()).items()
+        }
+    except (FileNotFoundError, ValueError):
+        pass
+
+    names = read_names(svg_file)
+    try:
+        fd, tmp = tempfile.mkstemp(dir=svg_file.parent, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(names, f)
+        os.replace(tmp, index_file)
+    except OSError:
+        pass  # Read-only shared directory.
+    return names
+
+
+class NamedMathTex(MathTex):
+    r"""``MathTex`` understanding ``\named{name}{...}``."""
+
+    def __init__(self, *tex_strings, tex_template=None, **kwargs):
+        tex_template = copy.deepcopy(tex_template or config.tex_template)
+        tex_template.add_to_preamble(NAMED_MACRO)
+        super().__init__(*tex_strings, tex_template=tex_template, **kwargs)
+        self.names = name_index(self.file_name)
+
+    def span(self, *names):
+        """Slice of the glyphs from the first to the last of ``names``."""
+        spans = [self.names[name] for name in names]
+        return slice(min(s for s, _ in spans), max(e for _, e in spans))
+
+    def part(self, *names):
+        """Group of the glyphs from the first to the last of ``names``."""
+        glyphs = [
+            glyph for group in self.submobjects for glyph in group.submobjects
+        ]
+        return VGroup(*glyphs[self.span(*names)])
@@ -0,0 +1,133 @@
+r"""Network diagrams built from a list of layer specs.
+
+Every layer is drawn as a stack of blocks, with an arrow to the next
+layer, its description below it and the label of its activation above the
+arrow. The blocks of all the layers are laid out in a single NumPy pass,
+e.g.::
+
+    diagram = NetworkDiagram([
+        LayerSpec("Conv2D", r"[a \times 1 \times 16]", width=1.0),
+        LayerSpec("Conv2D", r"[a \times 1 \times 8]", width=0.7),
+    ])
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+from manim import (
+    BLUE, DOWN, LEFT, RIGHT, UP, Arrow, Tex, VGroup, VMobject, WHITE,
+)
+
+from common.mobjects import straight_curves
+
+
+@dataclass
+class LayerSpec:
+    """One layer of a ``NetworkDiagram``."""
+
+    kind: str  # First line of the description, e.g. "Conv2D".
+    dims: str = ""  # Output shape, in LaTeX math, second line.
+    width: float = 0.1  # Width of the blocks.
+    channels: int = 3  # Number of stacked blocks.
+    color: str = BLUE
+    activation: str = ""  # Label of the arrow leaving the layer.
+
+
+class NetworkDiagram(VGroup):
+    """Layers of blocks joined by arrows, from left to right.
+
+    The layers are centered on the x axis, ``gap`` apart, the blocks of a
+    layer are ``block_height`` high and shifted by ``stack_shift`` from
+    one to the next, the first one at the bottom right. With
+    ``output_arrow`` the last layer has an arrow leaving it too.
+    """
+
+    def __init__(self, specs, block_height=0.1, stack_shift=(-0.08, 0.08),
+                 gap=1.75, output_arrow=True, stroke_width=1.5, **kwargs):
+        super().__init__(**kwargs)
+        self.specs = list(specs)
+
+        blocks = self._blocks(block_height, stack_shift, gap, stroke_width)
+        self.layers = VGroup()
+        start = 0
+        for spec in self.specs:
+            self.layers.add(VGroup(*blocks[start:start + spec.channels]))
+            start += spec.channels
+
+        self.arrows = VGroup()
+        for index, layer in enumerate(self.layers):
+            if index + 1 < len(self.layers):
+                end = self.layers[index + 1].get_left()
+            elif output_arrow:
+                end = layer.get_right() + RIGHT
+            else:
+                break
+            self.arrows.add(Arrow(
+                start=layer.get_right(),
+                end=end,
+                stroke_width=0.7,
+                tip_length=0.1,
+            ))
+
+        self.descriptions = VGroup(*(
+            Tex(
+                rf"{spec.kind}\\${spec.dims}$" if spec.dims else spec.kind,
+                font_size=15,
+            )
+            .next_to(layer.get_bottom())
+            .shift(DOWN * 0.3 + LEFT * 0.5)
+            for spec, layer in zip(self.specs, self.layers)
+        ))
+
+        self.activations = VGroup(*(
+            Tex(rf"\texttt{{{spec.activation}}}", font_size=12)
+            .next_to(arrow, UP)
+            .shift(DOWN * 0.2)
+            for spec, arrow in zip(self.specs, self.arrows)
+            if spec.activation
+        ))
+
+        self.add(self.layers, self.arrows, self.descriptions, self.activations)
+
+    def _blocks(self, block_height, stack_shift, gap, stroke_width):
+        channels = np.array([spec.channels for spec in self.specs])
+        widths = np.array([spec.width for spec in self.specs], dtype=float)
+        dx, dy = stack_shift
+
+        # Layers, left to right.
+        outer = widths + (channels - 1) * abs(dx)
+        lefts = np.concatenate([[0], np.cumsum(outer + gap)[:-1]])
+        centers = lefts + outer / 2
+
+        # Blocks, centered on their layer.
+        layer = np.repeat(np.arange(len(channels)), channels)
+        first = np.repeat(np.cumsum(channels) - channels, channels)
+        offset = np.arange(len(layer)) - first - (channels[layer] - 1) / 2
+        x = centers[layer] + offset * dx
+        y = offset * dy
+        half_width = widths[layer] / 2
+        half_height = block_height / 2
+
+        # Corners as the ones of a ``Rectangle``: UR, UL, DL, DR.
+        corners = np.zeros((len(layer), 5, 3))
+        corners[:, :, 0] = (
+            x[:, None] + np.array([1, -1, -1, 1, 1]) * half_width[:, None]
+        )
+        corners[:, :, 1] = (
+            y[:, None] + np.array([1, 1, -1, -1, 1]) * half_height
+        )
+        points = straight_curves(
+            corners[:, :-1].reshape(-1, 3), corners[:, 1:].reshape(-1, 3)
+        ).reshape(len(layer), -1, 3)
+
+        blocks = []
+        for block_points, index in zip(points, layer):
+            block = VMobject(
+                stroke_color=WHITE,
+                stroke_width=stroke_width,
+                fill_color=self.specs[index].color,
+                fill_opacity=1,
+            )
+            block.set_points(block_points)
+            blocks.append(block)
+        return blocks
@@ -0,0 +1,95 @@
+"""Piano rolls drawn from NumPy arrays and updated in place.
+
+A roll is an array of ``pitches x steps`` note values in [0, 1] (or
+booleans), e.g. the ``[1 x 128 x 16]`` bars of MidiNet. ``PianoRoll``
+maps them to the pixels of its image through a color lookup table,
+writing into the same buffer for every new bar, so bars streamed from a
+generator or a memory-mapped ``.npy`` file are shown without allocating or
+decoding anything per frame.
+"""
+
+import numpy as np
+from manim import BLACK, WHITE, ImageMobject, ManimColor
+from manim.constants import RESAMPLING_ALGORITHMS
+
+
+def load_bars(path):
+    """Bars stored in the ``.npy`` file ``path``, memory-mapped, as an array
+    of shape ``(count, ..., pitches, steps)``."""
+    return np.load(path, mmap_mode="r")
+
+
+class PianoRoll(ImageMobject):
+    """Image of a piano roll, highest pitch at the top.
+
+    Note values go from ``background`` (0) to ``color`` (1). ``width`` and
+    ``height`` default to one pixel per note at the default resolution.
+    """
+
+    def __init__(self, roll, color=WHITE, background=BLACK, width=None,
+                 height=None, **kwargs):
+        roll = np.asarray(roll)
+        shape = roll.shape[-2:]
+        super().__init__(np.zeros((*shape, 4), dtype=np.uint8), **kwargs)
+        self.set_resampling_algorithm(RESAMPLING_ALGORITHMS["nearest"])
+
+        # Color of every level of a note, from 0 to 255.
+        low = np.array(ManimColor(background).to_rgb())
+        high = np.array(ManimColor(color).to_rgb())
+        levels = np.linspace(0, 1, 256)[:, None]
+        self.lut = np.round(255 * (low + levels * (high - low)))
+        self.lut = self.lut.astype(np.uint8)
+
+        self._scaled = np.empty(shape, dtype=np.float32)
+        self._levels = np.empty(shape, dtype=np.uint8)
+        # set_opacity and fade scale the original alpha.
+        self.pixel_array[:, :, 3] = 255
+        self.orig_alpha_pixel_array = self.pixel_array[:, :, 3].copy()
+        self.set_roll(roll)
+
+        if width is not None:
+            self.stretch_to_fit_width(width)
+        if height is not None:
+            self.stretch_to_fit_height(height)
+
+    def set_roll(self, roll):
+        """Show ``roll``, written over the current pixels.
+
+        The alpha channel is left as it is, so an opacity set with
+        ``set_opacity`` is kept. Fade animations are different: manim
+        recomputes the pixels of every frame from copies of the image taken
+        when they start, rolls set during them are not shown.
+        """
+        roll = np.asarray(roll).reshape(self._levels.shape)
+        np.multiply(roll, 255, out=self._scaled, casting="unsafe")
+        np.copyto(self._levels, self._scaled, casting="unsafe")
+        np.take(
+            self.lut, self._levels[::-1], axis=0,
+            out=self.pixel_array[:, :, :3], mode="clip",
+        )
+        return self
+
+    def play_bars(self, bars, rate=1):
+        """Show the next of ``bars`` every ``1 / rate`` seconds.
+
+        ``bars`` is any iterable of rolls, e.g. a generator or the result
+        of ``load_bars``; only the current bar is read. The updater removes
+        itself once ``bars`` is exhausted.
+        """
+        bars = iter(bars)
+        period = 1 / rate
+        elapsed = period
+
+        def update(mob, dt):
+            nonlocal elapsed
+            elapsed += dt
+            while elapsed >= period:
+                elapsed -= period
+                bar = next(bars, None)
+                if bar is None:
+                    mob.remove_updater(update)
+                    return
+                mob.set_roll(bar)
+
+        self.add_updater(update)
+        return self
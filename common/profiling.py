@@ -0,0 +1,180 @@
+"""Profile of a render with one span per play, as a Chrome trace.
+
+Every ``play``/``wait`` gets a span tagged with the scene method and line
+calling it, which holds the spans of its frames: ``interpolate`` (moving
+the mobjects), ``rasterize`` (drawing them) and ``backpressure`` (waiting
+for a free buffer of ``common.streaming``, when all of them are pending)
+on the render thread, and ``encode`` (converting and compressing the frame)
+on manim's writer thread, which runs alongside the others. The code run
+between two plays, building the mobjects and compiling their LaTeX, gets a
+``construct`` span. Open the file in https://ui.perfetto.dev or
+chrome://tracing.
+"""
+
+import inspect
+import json
+import os
+import resource
+import sys
+import threading
+import time
+from pathlib import Path
+
+from manim.mobject.text import tex_mobject
+
+from common import tex_cache
+
+PHASES = ("interpolate", "rasterize", "backpressure", "encode")
+
+
+def _now():
+    return time.perf_counter_ns() // 1000
+
+
+def _peak_rss():
+    # Peak of the whole process so far, kilobytes on Linux, bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+class Tracer:
+    """Records the spans of the render of ``scene``."""
+
+    def __init__(self, scene):
+        self.scene = scene
+        self.script = os.path.abspath(inspect.getfile(type(scene)))
+        self.events = []
+        self.frames = 0
+        self.breakdown = None  # Time spent in each phase by the running play.
+        self.start = self.last_end = _now()
+        self._compile_tex = None
+
+    def install(self):
+        """Wrap the methods of the scene and its renderer to be timed."""
+        renderer = self.scene.renderer
+        renderer.play = self._play(renderer.play)
+        renderer.update_frame = self._phase("rasterize", renderer.update_frame)
+        file_writer = renderer.file_writer
+        file_writer.write_frame = self._write_frame(file_writer.write_frame)
+        file_writer.encode_and_write_frame = self._phase(
+            "encode", file_writer.encode_and_write_frame
+        )
+        streaming = getattr(self.scene, "streaming", None)
+        if streaming is not None:
+            streaming.wait_for_frame = self._phase(
+                "backpressure", streaming.wait_for_frame
+            )
+        self.scene.update_to_time = self._phase(
+            "interpolate", self.scene.update_to_time
+        )
+        self._compile_tex = tex_mobject.tex_to_svg_file
+        tex_mobject.tex_to_svg_file = self._tex(self._compile_tex)
+
+    def uninstall(self):
+        if self._compile_tex is not None:
+            tex_mobject.tex_to_svg_file = self._compile_tex
+
+    def caller(self):
+        """Scene method and line the current play is called from."""
+        frame = sys._getframe(2)
+        while frame is not None:
+            if os.path.abspath(frame.f_code.co_filename) == self.script:
+                return frame.f_code.co_name, frame.f_lineno
+            frame = frame.f_back
+        return None, None
+
+    def add(self, name, category, start, end, **args):
+        self.events.append({
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": start - self.start,
+            "dur": end - start,
+            "pid": os.getpid(),
+            "tid": threading.get_native_id(),
+            "args": args,
+        })
+
+    def _play(self, play):
+        def traced(scene, *args, **kwargs):
+            method, line = self.caller()
+            start = _now()
+            self.add("construct", "construct", self.last_end, start,
+                     method=method, line=line)
+
+            self.breakdown = dict.fromkeys(PHASES, 0)
+            frames = self.frames
+            peak = _peak_rss()
+            try:
+                play(scene, *args, **kwargs)
+            finally:
+                end = self.last_end = _now()
+                breakdown, self.breakdown = self.breakdown, None
+                rss = _peak_rss()
+                names = [type(a).__name__ for a in scene.animations or ()]
+                self.add(
+                    ", ".join(names) or "play", "play", start, end,
+                    method=method,
+                    line=line,
+                    skipped=scene.renderer.skip_animations,
+                    frames=self.frames - frames,
+                    # Memory the play used beyond the previous peak.
+                    peak_rss_growth_kib=rss - peak,
+                    process_peak_rss_kib=rss,
+                    **{f"{phase}_ms": breakdown[phase] / 1000
+                       for phase in PHASES},
+                )
+        return traced
+
+    def _phase(self, phase, function):
+        def traced(*args, **kwargs):
+            start = _now()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                end = _now()
+                self.add(phase, phase, start, end)
+                if self.breakdown is not None:
+                    self.breakdown[phase] += end - start
+        return traced
+
+    def _write_frame(self, write_frame):
+        # Only queues the frame for the writer thread.
+        def traced(frame, num_frames=1):
+            self.frames += num_frames
+            return write_frame(frame, num_frames)
+        return traced
+
+    def _tex(self, tex_to_svg_file):
+        def traced(expression, *args, **kwargs):
+            start = _now()
+            try:
+                return tex_to_svg_file(expression, *args, **kwargs)
+            finally:
+                self.add("tex", "tex", start, _now(), expression=expression)
+        return traced
+
+    def summary(self):
+        """Totals of the render, stored with the trace."""
+        cache = tex_cache.installed
+        return {
+            "scene": type(self.scene).__name__,
+            "wall_ms": (_now() - self.start) / 1000,
+            "frames": self.frames,
+            "process_peak_rss_kib": _peak_rss(),
+            "tex_cache_hits": cache.hits if cache else None,
+            "tex_cache_misses": cache.misses if cache else None,
+        }
+
+    def write(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(
+                {
+                    "traceEvents": self.events,
+                    "displayTimeUnit": "ms",
+                    "otherData": self.summary(),
+                },
+                f,
+            )
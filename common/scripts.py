@@ -0,0 +1,70 @@
+"""Load the scene scripts of this repository outside the manim CLI."""
+
+import hashlib
+import importlib.util
+import os
+import re
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+
+COMMON_DIR = Path(__file__).resolve().parent
+
+
+@contextmanager
+def script_dir(script):
+    """Run the body from the directory of ``script``.
+
+    The scenes load their assets with paths relative to it, as they do when
+    rendered with ``manim`` from there.
+    """
+    cwd = os.getcwd()
+    os.chdir(Path(script).resolve().parent)
+    try:
+        yield
+    finally:
+        os.chdir(cwd)
+
+
+def _module_name(script):
+    """Name ``script`` is imported as, unique to its path: the scenes all
+    live in a ``main.py``."""
+    script = Path(script).resolve()
+    try:
+        parts = script.relative_to(COMMON_DIR.parent).with_suffix("").parts
+    except ValueError:
+        parts = script.with_suffix("").parts[1:]
+    return "_".join(re.sub(r"\W", "_", part) for part in parts)
+
+
+def load_module(script):
+    """Import ``script`` the way the manim CLI does, with the directory of
+    ``script`` on the path for the modules next to it."""
+    script = Path(script).resolve()
+    name = _module_name(script)
+    spec = importlib.util.spec_from_file_location(name, script)
+    module = importlib.util.module_from_spec(spec)
+    if str(script.parent) not in sys.path:
+        sys.path.insert(0, str(script.parent))
+    sys.modules[name] = module
+    with script_dir(script):
+        spec.loader.exec_module(module)
+    return module
+
+
+def module_files(script):
+    """Modules the scenes of ``script`` can import: the ones next to it and
+    the ones of ``common``, without ``script`` itself."""
+    script = Path(script).resolve()
+    files = {*script.parent.glob("*.py"), *COMMON_DIR.glob("*.py")}
+    files.discard(script)
+    return sorted(files)
+
+
+def files_digest(files):
+    """SHA-256 of the names and contents of ``files``."""
+    digest = hashlib.sha256()
+    for path in files:
+        digest.update(Path(path).name.encode())
+        digest.update(Path(path).read_bytes())
+    return digest.hexdigest()
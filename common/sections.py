@@ -0,0 +1,267 @@
+"""Scenes made of sections that can be rendered one at a time."""
+
+import os
+
+import numpy as np
+from manim import (
+    config,
+    AnimationGroup,
+    DrawBorderThenFill,
+    Scene,
+    ShowPartial,
+    Transform,
+    Wait,
+)
+from tqdm import tqdm
+
+from common import checkpoint, fused, holds, profiling, streaming
+from common.env import (
+    FRAMES_ENV,
+    SECTION_ENV,
+    SHARD_ENV,
+    STREAM_ENV,
+    TILES_ENV,
+    TRACE_ENV,
+    trace_path,
+)
+from common.tiled_camera import TiledCamera
+
+
+# Margin around the animated mobjects covering their stroke, in scene units.
+DIRTY_MARGIN = 0.1
+
+
+def _flatten(animations):
+    for animation in animations:
+        if isinstance(animation, AnimationGroup):
+            yield from _flatten(animation.animations)
+        else:
+            yield animation
+
+
+def _box(*mobjects):
+    points = [mob.get_all_points() for mob in mobjects if mob is not None]
+    points = [p for p in points if len(p)]
+    if not points:
+        return None
+    points = np.concatenate(points)[:, :2]
+    return (
+        points.min(axis=0) - DIRTY_MARGIN,
+        points.max(axis=0) + DIRTY_MARGIN,
+    )
+
+
+class SectionScene(Scene):
+    """Scene whose ``construct`` runs the methods listed in ``sections``.
+
+    Every method becomes a manim section. When ``SCENE_SECTION`` names one
+    of them, the sections before it are still executed, with their
+    animations skipped, so the selected one starts from the same state it
+    would have in a full render; the sections after it are not executed.
+
+    When ``SCENE_TILES`` is set, frames are rasterized in that many bands
+    in parallel by a ``TiledCamera``.
+
+    When ``SCENE_SHARD`` is ``k/n``, every rendered play only writes the
+    k-th of n consecutive parts of its frames, see ``render.py shard``.
+
+    When ``SCENE_CHECKPOINT_DIR`` is set, the mobjects and the attributes
+    listed in ``checkpoint_attrs`` are saved there at the end of every
+    section, and a render of a selected section starts from the latest
+    snapshot of the sections before it instead of running them.
+
+    Transforms played together are interpolated in a single NumPy pass by
+    ``common.fused.FusedTransforms``.
+
+    Manim encodes the frames on a writer thread, ``SCENE_STREAM_FRAMES``
+    bounds how many of them can wait to be encoded (0 for no bound).
+
+    When ``SCENE_TRACE`` is set, a profile of the render is written there,
+    see ``common.profiling`` and ``common.env.trace_path``.
+    """
+
+    sections = ()
+    checkpoint_attrs = ()
+
+    def __init__(self, **kwargs):
+        if os.environ.get(TILES_ENV):
+            kwargs.setdefault("camera_class", TiledCamera)
+        super().__init__(**kwargs)
+
+    def setup(self):
+        holds.install(self.renderer.file_writer)
+        self.streaming = streaming.install(
+            self.renderer,
+            int(os.environ.get(STREAM_ENV, streaming.DEFAULT_RING_FRAMES)),
+        )
+        self.tracer = None
+        if os.environ.get(TRACE_ENV):
+            self.tracer = profiling.Tracer(self)
+            self.tracer.install()
+
+    def tear_down(self):
+        if isinstance(self.renderer.camera, TiledCamera):
+            self.renderer.camera.close()
+        if self.streaming is not None:
+            self.streaming.close()
+        if self.tracer is not None:
+            self.tracer.uninstall()
+            self.tracer.write(trace_path(
+                os.environ[TRACE_ENV], os.environ.get(SECTION_ENV)
+            ))
+
+    def construct(self):
+        selected = os.environ.get(SECTION_ENV)
+        if selected and selected not in self.sections:
+            raise ValueError(
+                f"{type(self).__name__} has no section {selected!r}"
+            )
+
+        start = 0
+        if selected:
+            for i in range(self.sections.index(selected), 0, -1):
+                path = checkpoint.checkpoint_path(self, self.sections[i - 1])
+                if path is not None and path.exists():
+                    checkpoint.load(self, path)
+                    start = i
+                    break
+
+        for name in self.sections[start:]:
+            skip = bool(selected) and name != selected
+            self.next_section(name, skip_animations=skip)
+            getattr(self, name)()
+            self.end_section(name)
+
+            path = checkpoint.checkpoint_path(self, name)
+            if path is not None:
+                checkpoint.save(self, path)
+
+            if name == selected:
+                break
+
+    def end_section(self, name):
+        """Called after each section, within it."""
+
+    def keep_in_background(self, *mobjects):
+        """Move the given mobjects that are on screen behind the others.
+
+        For every play, the Cairo renderer rasterizes once the mobjects that
+        come before the first animated one and reuses that image for every
+        frame. Long-lived mobjects kept at the back stay in that image while
+        the overlays drawn in front of them animate.
+        """
+        self.bring_to_back(*(mob for mob in mobjects if mob in self.mobjects))
+
+    def compile_animations(self, *args, **kwargs):
+        animations = super().compile_animations(*args, **kwargs)
+        # Transforms played together are interpolated in a single pass.
+        if self.renderer.skip_animations:
+            return animations
+        return fused.fuse(animations)
+
+    def add_mobjects_from_animations(self, animations):
+        super().add_mobjects_from_animations(list(fused.expand(animations)))
+
+    def get_moving_mobjects(self, *animations):
+        # Manim redraws every mobject after the first animated one, so the
+        # z-order is kept. The ones that do not overlap the region the
+        # animations can touch are left in the static background instead.
+        animations = list(fused.expand(animations))
+        moving = super().get_moving_mobjects(*animations)
+        if not moving or any(
+            mob.get_family_updaters() or mob in self.foreground_mobjects
+            for mob in moving
+        ):
+            return moving
+
+        boxes = []
+        for animation in _flatten(animations):
+            if isinstance(animation, Wait):
+                continue
+            # Only the animations that stay between their start and end
+            # state have a known region.
+            if not isinstance(
+                animation, (Transform, ShowPartial, DrawBorderThenFill)
+            ) or getattr(animation, "path_arc", 0):
+                return moving
+            box = _box(
+                animation.mobject,
+                getattr(animation, "starting_mobject", None),
+                getattr(animation, "target_copy", None),
+            )
+            if box is not None:
+                boxes.append(box)
+
+        animated = {
+            id(member)
+            for animation in animations
+            for member in animation.mobject.get_family()
+        }
+
+        # Groups would bring all their members along, their members are
+        # checked one by one. A redrawn mobject covers what is behind it, so
+        # what overlaps it must be redrawn too.
+        kept = []
+        for mob in moving:
+            if id(mob) in animated:
+                kept.append(mob)
+            elif mob.has_points():
+                box = _box(mob)
+                if any(
+                    np.all(box[0] <= high) and np.all(low <= box[1])
+                    for low, high in boxes
+                ):
+                    kept.append(mob)
+                    boxes.append(box)
+        return kept
+
+    def get_time_progression(self, run_time, description, n_iterations=None,
+                             override_skip_animations=False):
+        progression = super().get_time_progression(
+            run_time, description, n_iterations, override_skip_animations
+        )
+        frames = os.environ.get(FRAMES_ENV)
+        shard = os.environ.get(SHARD_ENV)
+        if not (frames or shard) or (
+            self.renderer.skip_animations and not override_skip_animations
+        ):
+            return progression
+
+        progression.close()
+        times = np.asarray(progression.iterable)
+        if frames:
+            # The frames are only counted.
+            with open(frames, "a") as f:
+                print(len(times), file=f)
+            times = times[:0]
+        else:
+            # A frame only depends on the alpha of the animations, unless an
+            # updater accumulates the time steps.
+            if (
+                self.always_update_mobjects
+                or self.updaters
+                or any(
+                    mob.has_time_based_updater()
+                    for mob in self.get_mobject_family_members()
+                )
+            ):
+                raise ValueError(
+                    "plays with time based updaters cannot be split in shards"
+                )
+            index, count = (int(n) for n in shard.split("/"))
+            times = np.array_split(times, count)[index]
+            description = f"{description} [{index + 1}/{count}]"
+        return tqdm(
+            times,
+            desc=description,
+            leave=config["progress_bar"] == "leave",
+            ascii=True,
+            disable=config["progress_bar"] == "none",
+        )
+
+    def is_current_animation_frozen_frame(self):
+        # A held frame is written as a whole, in shards every frame of a
+        # wait goes through the time progression instead.
+        if os.environ.get(SHARD_ENV) or os.environ.get(FRAMES_ENV):
+            return False
+        return super().is_current_animation_frozen_frame()
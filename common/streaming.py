@@ -0,0 +1,109 @@
+"""Bound the frames waiting to be encoded, reusing their buffers.
+
+Manim encodes the frames of a play on a writer thread, fed by an unbounded
+queue: every frame is a fresh copy of the camera pixels, and when encoding
+is slower than rendering the pending copies pile up in memory. Here the
+frames are copied into a ring of preallocated buffers instead. A buffer is
+handed back once manim's writer thread has encoded its frame, and the
+renderer waits when all of them are pending, so the queue never holds more
+than the size of the ring.
+"""
+
+import queue
+
+import numpy as np
+from manim import config
+
+DEFAULT_RING_FRAMES = 8
+
+
+class FrameRing:
+    """Preallocated frames, handed out once encoded."""
+
+    def __init__(self, shape, dtype, size):
+        self.slots = [np.empty(shape, dtype) for _ in range(size)]
+        self.indices = {id(slot): i for i, slot in enumerate(self.slots)}
+        self.free = queue.SimpleQueue()
+        for i in range(size):
+            self.free.put(i)
+
+    def acquire(self, alive):
+        """Next free frame, waiting for one as long as ``alive()``."""
+        while True:
+            try:
+                return self.slots[self.free.get(timeout=1)]
+            except queue.Empty:
+                if not alive():
+                    raise RuntimeError("the video writer thread stopped")
+
+    def release(self, frame):
+        # Held frames do not come from the ring.
+        index = self.indices.get(id(frame))
+        if index is not None:
+            self.free.put(index)
+
+
+class StreamingWriter:
+    """Patches a Cairo renderer to hand its frames to manim's writer
+    thread through a ring of buffers."""
+
+    def __init__(self, renderer, size=DEFAULT_RING_FRAMES):
+        self.renderer = renderer
+        self.size = size
+        self.ring = None
+
+        file_writer = renderer.file_writer
+        self._render = renderer.render
+        self._encode = file_writer.encode_and_write_frame
+        renderer.render = self.render
+        file_writer.encode_and_write_frame = self.encode_and_write_frame
+
+    def render(self, scene, time, moving_mobjects):
+        renderer = self.renderer
+        if renderer.skip_animations:
+            return self._render(scene, time, moving_mobjects)
+
+        renderer.update_frame(scene, moving_mobjects)
+        pixels = renderer.camera.pixel_array
+        if self.ring is None:
+            self.ring = FrameRing(pixels.shape, pixels.dtype, self.size)
+        frame = self.wait_for_frame()
+        np.copyto(frame, pixels)
+        renderer.add_frame(frame)
+
+    def wait_for_frame(self):
+        """Free buffer of the ring, once the writer thread encoded one."""
+        writer = self.renderer.file_writer
+        return self.ring.acquire(
+            lambda: getattr(writer, "writer_thread", None) is not None
+            and writer.writer_thread.is_alive()
+        )
+
+    def encode_and_write_frame(self, frame, num_frames):
+        # Called on manim's writer thread.
+        try:
+            self._encode(frame, num_frames)
+        finally:
+            if self.ring is not None:
+                self.ring.release(frame)
+
+    def close(self):
+        """Give the renderer back its own methods."""
+        self.renderer.render = self._render
+        self.renderer.file_writer.encode_and_write_frame = self._encode
+
+
+def install(renderer, size=DEFAULT_RING_FRAMES):
+    """Encode the frames of ``renderer`` from a ring of ``size`` buffers.
+
+    Returns the ``StreamingWriter``, or ``None`` when the frames are not
+    encoded to a video, or ``size`` is 0.
+    """
+    if (
+        not size
+        or not config.write_to_movie
+        or config.format == "png"
+        or not hasattr(renderer.file_writer, "encode_and_write_frame")
+    ):
+        return None
+    return StreamingWriter(renderer, size)
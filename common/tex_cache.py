@@ -0,0 +1,126 @@
+"""Content-addressed cache of compiled LaTeX shared between renders.
+
+Manim keeps the SVG files it compiles in the media directory of every
+project. This cache stores them by the hash of the full LaTeX document
+instead, so any scene, checkout or machine pointing at the same directory
+reuses them.
+"""
+
+import hashlib
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+from manim import config
+from manim.mobject.text import tex_mobject
+from manim.utils import tex_file_writing
+
+# List of cache directories separated by ``os.pathsep``. New entries are
+# written in the first one, the others (e.g. a directory filled by CI) are
+# only read.
+CACHE_ENV = "MANIM_TEX_CACHE"
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "manim-projects" / "tex"
+DEFAULT_MAX_BYTES = 256 * 2**20
+
+_compile_tex_to_svg_file = tex_file_writing.tex_to_svg_file
+
+# The cache set up by ``install``, if any.
+installed = None
+
+
+class TexCache:
+    """LaTeX to SVG compiler backed by a size bounded LRU cache."""
+
+    def __init__(self, directories=None, max_bytes=DEFAULT_MAX_BYTES):
+        if directories is None:
+            env = os.environ.get(CACHE_ENV)
+            directories = env.split(os.pathsep) if env else [DEFAULT_CACHE_DIR]
+        self.directories = [Path(d).expanduser() for d in directories]
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, expression, environment=None, tex_template=None):
+        """Hash of everything that affects the compiled SVG."""
+        tex_template = tex_template or config.tex_template
+        if environment is not None:
+            source = tex_template.get_texcode_for_expression_in_env(
+                expression, environment
+            )
+        else:
+            source = tex_template.get_texcode_for_expression(expression)
+
+        digest = hashlib.sha256()
+        for part in (
+            source,
+            getattr(tex_template, "tex_compiler", ""),
+            getattr(tex_template, "output_format", ""),
+        ):
+            digest.update(part.encode())
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def lookup(self, key):
+        """Return the cached SVG for ``key``, or ``None``."""
+        for directory in self.directories:
+            path = directory / f"{key}.svg"
+            if path.exists():
+                try:
+                    os.utime(path)  # Mark as recently used.
+                except OSError:
+                    pass  # Read-only shared directory.
+                return path
+        return None
+
+    def tex_to_svg_file(self, expression, environment=None, tex_template=None):
+        """Drop-in replacement of manim's ``tex_to_svg_file``."""
+        key = self.key(expression, environment, tex_template)
+        path = self.lookup(key)
+        if path is not None:
+            self.hits += 1
+            return path
+
+        self.misses += 1
+        svg = _compile_tex_to_svg_file(expression, environment, tex_template)
+        path = self.store(key, svg)
+        self.evict()
+        return path
+
+    def store(self, key, svg):
+        """Copy ``svg`` in the writable directory, atomically."""
+        directory = self.directories[0]
+        directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        os.close(fd)
+        shutil.copyfile(svg, tmp)
+        path = directory / f"{key}.svg"
+        os.replace(tmp, path)
+        return path
+
+    def evict(self):
+        """Remove the least recently used entries above ``max_bytes``."""
+        entries = []
+        for path in self.directories[0].glob("*.svg"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue  # Evicted by another process.
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            # Index of the named parts, see ``common.named_tex``.
+            path.with_suffix(".names.json").unlink(missing_ok=True)
+            total -= size
+
+
+def install(directories=None, max_bytes=DEFAULT_MAX_BYTES):
+    """Make every ``Tex``/``MathTex`` compile through a shared cache."""
+    global installed
+    cache = installed = TexCache(directories, max_bytes)
+    tex_mobject.tex_to_svg_file = cache.tex_to_svg_file
+    return cache
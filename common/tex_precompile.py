@@ -0,0 +1,117 @@
+"""Compile every LaTeX string of a scene in parallel before rendering it.
+
+The strings are found by running the scene with its animations skipped and
+LaTeX replaced by a placeholder, then they are compiled in a process pool
+through the shared cache of :mod:`common.tex_cache`, where the real render
+finds them.
+
+Example:
+    python -m common.tex_precompile MidiNetStructure/main.py MidiNet
+"""
+
+import argparse
+import inspect
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from manim import logger, tempconfig
+from manim.mobject.text import tex_mobject
+
+from common import named_tex
+from common.scripts import load_module, script_dir
+from common.tex_cache import TexCache
+
+# Number of glyphs of the placeholder SVG, enough for the scenes to index
+# into any formula.
+PLACEHOLDER_GLYPHS = 512
+
+
+def _placeholder_svg(directory):
+    path = Path(directory) / "placeholder.svg"
+    glyphs = "".join(
+        f'<path d="M{i} 0h0.5v1h-0.5z"/>' for i in range(PLACEHOLDER_GLYPHS)
+    )
+    path.write_text(
+        '<svg xmlns="http://www.w3.org/2000/svg" '
+        f'viewBox="0 0 {PLACEHOLDER_GLYPHS} 1">{glyphs}</svg>'
+    )
+    return path
+
+
+class _AnyNames(dict):
+    # Every name of a ``NamedMathTex`` points at the first placeholder glyph.
+    def __missing__(self, name):
+        return (0, 1)
+
+
+def collect_tex_sources(scene_class):
+    """Return the ``(expression, environment, tex_template)`` a scene uses.
+
+    The scene may fail on the placeholder geometry, in that case the error
+    is logged and the strings found up to that point are returned.
+    """
+    sources = {}
+    key = TexCache([]).key
+    compile_tex = tex_mobject.tex_to_svg_file
+    name_index = named_tex.name_index
+
+    with tempfile.TemporaryDirectory() as tmp:
+        placeholder = _placeholder_svg(tmp)
+
+        def record(expression, environment=None, tex_template=None):
+            sources[key(expression, environment, tex_template)] = (
+                expression, environment, tex_template,
+            )
+            return placeholder
+
+        tex_mobject.tex_to_svg_file = record
+        named_tex.name_index = lambda svg_file: _AnyNames()
+        try:
+            with tempconfig({"dry_run": True, "disable_caching": True}):
+                scene = scene_class()
+                scene.renderer._original_skipping_status = True
+                scene.renderer.skip_animations = True
+                scene.render()
+        except Exception:
+            logger.warning(
+                "Collecting the LaTeX of %s in %s stopped early, the rest is "
+                "compiled during the render",
+                scene_class.__name__, inspect.getfile(scene_class),
+                exc_info=True,
+            )
+        finally:
+            tex_mobject.tex_to_svg_file = compile_tex
+            named_tex.name_index = name_index
+
+    return list(sources.values())
+
+
+def _compile(source):
+    TexCache().tex_to_svg_file(*source)
+
+
+def precompile(scene_class, jobs=None):
+    """Compile in parallel the LaTeX used by ``scene_class``."""
+    sources = collect_tex_sources(scene_class)
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        list(pool.map(_compile, sources))
+    return len(sources)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("script", help="path of the scene file")
+    parser.add_argument("scene", help="name of the scene class")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="number of worker processes")
+    args = parser.parse_args(argv)
+
+    scene_class = getattr(load_module(args.script), args.scene)
+    with script_dir(args.script):
+        count = precompile(scene_class, args.jobs)
+    print(f"{count} LaTeX strings compiled")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Cairo camera rasterizing each frame in bands on a thread pool."""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import cairo
+import numpy as np
+from manim import Camera
+
+from common.env import TILES_ENV
+
+
+class TiledCamera(Camera):
+    """Camera drawing the vectorized mobjects of a frame in bands of rows.
+
+    A band of rows is contiguous in the pixel array, so every worker draws
+    on its own cairo surface over its rows; cairo clips the paths to it and
+    pycairo releases the GIL while filling and stroking. The mobjects that
+    are out of a band are not drawn on it. With ``tiles`` 1 or less,
+    frames are drawn as a whole, as by ``Camera``.
+    """
+
+    def __init__(self, *args, tiles=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if tiles is None:
+            tiles = int(os.environ.get(TILES_ENV) or os.cpu_count())
+        self.tiles = max(tiles, 1)
+        self.tile_pool = None
+        if self.tiles > 1:
+            self.tile_pool = ThreadPoolExecutor(self.tiles)
+
+    def close(self):
+        """Stop the threads drawing the bands."""
+        if self.tile_pool is not None:
+            self.tile_pool.shutdown()
+            self.tile_pool = None
+
+    def display_multiple_non_background_colored_vmobjects(self, vmobjects,
+                                                          pixel_array):
+        vmobjects = list(vmobjects)
+        if self.tile_pool is None or len(vmobjects) < 2:
+            return super().display_multiple_non_background_colored_vmobjects(
+                vmobjects, pixel_array
+            )
+
+        spans = [self._row_span(vmobject) for vmobject in vmobjects]
+        bounds = np.linspace(0, self.pixel_height, self.tiles + 1).astype(int)
+        list(self.tile_pool.map(
+            lambda band: self._display_band(vmobjects, spans, pixel_array, *band),
+            zip(bounds[:-1], bounds[1:]),
+        ))
+        return self
+
+    def _row_span(self, vmobject):
+        # Rows covered by the mobject, stroke included.
+        if not len(vmobject.points):
+            return np.inf, -np.inf
+        scale = self.pixel_height / self.frame_height
+        rows = (
+            self.pixel_height / 2
+            + (self.frame_center[1] - vmobject.points[:, 1]) * scale
+        )
+        width = max(
+            vmobject.get_stroke_width(),
+            vmobject.get_stroke_width(background=True),
+        )
+        margin = width * self.cairo_line_width_multiple * scale + 2
+        return rows.min() - margin, rows.max() + margin
+
+    def _display_band(self, vmobjects, spans, pixel_array, top, bottom):
+        if bottom <= top:
+            return
+        pw, ph = self.pixel_width, self.pixel_height
+        fw, fh = self.frame_width, self.frame_height
+        fc = self.frame_center
+
+        surface = cairo.ImageSurface.create_for_data(
+            pixel_array[top:bottom].data, cairo.FORMAT_ARGB32,
+            pw, bottom - top, pixel_array.strides[0],
+        )
+        ctx = cairo.Context(surface)
+        # Same transformation as Camera.get_cairo_context, moved up by the
+        # rows above the band.
+        ctx.set_matrix(cairo.Matrix(
+            pw / fw, 0,
+            0, -(ph / fh),
+            (pw / 2) - fc[0] * (pw / fw),
+            (ph / 2) + fc[1] * (ph / fh) - top,
+        ))
+        for vmobject, (low, high) in zip(vmobjects, spans):
+            if high >= top and low < bottom:
+                self.display_vectorized(vmobject, ctx)
+        surface.flush()
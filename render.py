@@ -0,0 +1,567 @@
+"""Render the scenes of this repository.
+
+Examples:
+    python render.py sections AlternatingCriteriaSearch/main.py ACS -q l
+    python render.py watch MidiNetStructure/main.py MidiNet
+    python render.py shard AlternatingCriteriaSearch/main.py ACS 42 -j 8
+    python render.py bench --threshold 10
+    python render.py serve &
+    python render.py submit MidiNetStructure/main.py MidiNet -s generator
+"""
+
+import argparse
+import ast
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from common import daemon
+from common.scripts import files_digest, module_files
+from common.env import (
+    FRAMES_ENV,
+    SECTION_ENV,
+    SHARD_ENV,
+    TILES_ENV,
+    TRACE_ENV,
+    trace_path,
+)
+
+ROOT = Path(__file__).resolve().parent
+
+# Scenes rendered by ``bench``, as a whole and section by section.
+BENCH_SCENES = (
+    ("AlternatingCriteriaSearch/main.py", "ACS"),
+    ("MidiNetStructure/main.py", "MidiNet"),
+)
+BENCH_BASELINE = ROOT / "benchmarks" / "baseline.json"
+
+# Directory manim writes the videos of every quality flag to, named after
+# their height and frame rate.
+QUALITY_DIRS = {
+    "l": "480p15",
+    "m": "720p30",
+    "h": "1080p60",
+    "p": "1440p60",
+    "k": "2160p60",
+}
+
+
+# Methods run for every section, whatever section is rendered.
+COMMON_METHODS = ("__init__", "setup", "end_section")
+
+
+def _scene_node(tree, script, scene):
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef) and node.name == scene:
+            return node
+    raise ValueError(f"{script} has no scene {scene}")
+
+
+def read_sections(script, scene):
+    """Return the ``sections`` tuple of ``scene`` without importing ``script``."""
+    node = _scene_node(ast.parse(Path(script).read_text()), script, scene)
+    for item in node.body:
+        if (
+            isinstance(item, ast.Assign)
+            and len(item.targets) == 1
+            and isinstance(item.targets[0], ast.Name)
+            and item.targets[0].id == "sections"
+        ):
+            return tuple(ast.literal_eval(item.value))
+    raise ValueError(f"{scene} in {script} does not define sections")
+
+
+def section_digest(script, scene, section):
+    """Hash of the code a section of ``scene`` runs.
+
+    It covers the section method and the ones before it, which build the
+    state it starts from, the methods they call on ``self``, the methods run
+    for every section, the code of the script outside the scene class and
+    the modules the script can import (see ``common.scripts.module_files``).
+    """
+    source = Path(script).read_text()
+    tree = ast.parse(source)
+    node = _scene_node(tree, script, scene)
+    methods = {
+        item.name: item for item in node.body
+        if isinstance(item, ast.FunctionDef)
+    }
+    sections = read_sections(script, scene)
+    preceding = sections[:sections.index(section)]
+
+    # Follow the calls to other methods of the scene.
+    reached = []
+    pending = [*COMMON_METHODS, *preceding, section]
+    while pending:
+        name = pending.pop()
+        if name in reached or name not in methods:
+            continue
+        reached.append(name)
+        for call in ast.walk(methods[name]):
+            if (
+                isinstance(call, ast.Attribute)
+                and isinstance(call.value, ast.Name)
+                and call.value.id == "self"
+            ):
+                pending.append(call.attr)
+
+    digest = hashlib.sha256(
+        files_digest(module_files(script)).encode()
+    )
+    for item in tree.body:
+        if item is not node:
+            digest.update(ast.dump(item).encode())
+    for item in node.body:
+        if not isinstance(item, ast.FunctionDef):
+            digest.update(ast.dump(item).encode())
+    for name in sorted(reached):
+        digest.update(ast.dump(methods[name]).encode())
+    return digest.hexdigest()
+
+
+def _manim_command(script, scene, quality, media_dir, output, args=()):
+    return [
+        sys.executable, "-m", "manim", "render",
+        f"-q{quality}",
+        "--media_dir", str(media_dir),
+        "-o", output,
+        *args,
+        script.name, scene,
+    ]
+
+
+def run_manim(script, scene, quality, media_dir, output, env=None, args=()):
+    """Render ``scene`` in its own manim process.
+
+    Returns the path of the produced video.
+    """
+    script = Path(script).resolve()
+    media_dir = Path(media_dir).resolve()
+    subprocess.run(
+        _manim_command(script, scene, quality, media_dir, output, args),
+        cwd=script.parent,
+        env=env,
+        check=True,
+    )
+
+    # Renders that only hold skipped animations produce no video.
+    video = (
+        media_dir / "videos" / script.stem / QUALITY_DIRS[quality]
+        / f"{output}.mp4"
+    )
+    return video if video.exists() else None
+
+
+def render_section(script, scene, section, quality, media_dir, env=None):
+    """Render one section of ``scene`` in its own manim process.
+
+    Returns the path of the produced video.
+    """
+    env = dict(os.environ if env is None else env)
+    env[SECTION_ENV] = section
+    return run_manim(
+        script, scene, quality, media_dir, f"{scene}_{section}", env
+    )
+
+
+def concat_videos(videos, output):
+    """Join ``videos`` into ``output`` without re-encoding them."""
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+        for video in videos:
+            f.write(f"file '{Path(video).resolve()}'\n")
+        listing = f.name
+    try:
+        subprocess.run(
+            [
+                "ffmpeg", "-y", "-loglevel", "error",
+                "-f", "concat", "-safe", "0", "-i", listing,
+                "-c", "copy", str(output),
+            ],
+            check=True,
+        )
+    finally:
+        os.unlink(listing)
+
+
+def precompile_tex(script, scene, jobs=None):
+    """Fill the LaTeX cache with every string ``scene`` uses."""
+    subprocess.run(
+        [
+            sys.executable, "-m", "common.tex_precompile",
+            str(script), scene,
+        ]
+        + (["-j", str(jobs)] if jobs else []),
+        cwd=ROOT,
+        check=True,
+    )
+
+
+def render_sections(script, scene, quality="l", jobs=None, output=None,
+                    precompile=True, tiles=None):
+    """Render the sections of ``scene`` in parallel and stitch them.
+
+    The video of every section is kept under ``media/segments`` keyed by
+    the code it runs (see ``section_digest``), only the sections whose code
+    changed since their last render are rendered again.
+    """
+    script = Path(script).resolve()
+    sections = read_sections(script, scene)
+    media_root = script.parent / "media"
+    output = Path(output) if output else media_root / f"{scene}.mp4"
+
+    segments_dir = media_root / "segments" / scene
+    segments = {
+        section: segments_dir / (
+            f"{section}-{quality}-"
+            f"{section_digest(script, scene, section)[:16]}.mp4"
+        )
+        for section in sections
+    }
+    # Sections that produce no video leave an empty marker instead.
+    empty = {
+        section: path.with_suffix(".empty")
+        for section, path in segments.items()
+    }
+    missing = [
+        section for section in sections
+        if not segments[section].exists() and not empty[section].exists()
+    ]
+
+    # Otherwise every worker compiles the LaTeX of the sections it skips.
+    if missing and precompile:
+        precompile_tex(script, scene, jobs)
+
+    env = dict(os.environ)
+    if tiles:
+        env[TILES_ENV] = str(tiles)
+
+    # Every worker gets its own media directory, manim is not meant to
+    # share one between concurrent processes.
+    with ThreadPoolExecutor(max_workers=jobs or len(missing) or 1) as pool:
+        videos = pool.map(
+            lambda section: render_section(
+                script, scene, section, quality,
+                media_root / "sections" / scene / section, env,
+            ),
+            missing,
+        )
+        segments_dir.mkdir(parents=True, exist_ok=True)
+        for section, video in zip(missing, videos):
+            for old in segments_dir.glob(f"{section}-{quality}-*"):
+                old.unlink()
+            if video is not None:
+                shutil.copyfile(video, segments[section])
+            else:
+                empty[section].touch()
+
+    concat_videos(
+        [segments[s] for s in sections if segments[s].exists()], output
+    )
+    return output
+
+
+def play_frames(script, scene, play, quality="l"):
+    """Number of frames of the play number ``play`` of ``scene``.
+
+    The scene runs up to that play without rendering or writing anything.
+    """
+    script = Path(script).resolve()
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ)
+        env[FRAMES_ENV] = os.path.join(tmp, "frames")
+        run_manim(
+            script, scene, quality, tmp, f"{scene}_play{play}", env,
+            ["--disable_caching", "--dry_run", "-n", f"{play},{play}"],
+        )
+        try:
+            with open(env[FRAMES_ENV]) as f:
+                return sum(int(line) for line in f)
+        except FileNotFoundError:
+            return 0
+
+
+def render_play_shards(script, scene, play, quality="l", jobs=None,
+                       output=None):
+    """Render the play number ``play`` of ``scene`` split across processes.
+
+    Every worker runs the scene up to that play with the animations skipped,
+    then renders its own consecutive part of the frames of the play. The
+    parts are joined in order.
+    """
+    script = Path(script).resolve()
+    jobs = jobs or os.cpu_count()
+    precompile_tex(script, scene, jobs)
+
+    frames = play_frames(script, scene, play, quality)
+    if not frames:
+        raise ValueError(f"{scene} has no frames to render in play {play}")
+    # Every shard gets at least one frame.
+    jobs = min(jobs, frames)
+    media_root = script.parent / "media"
+    output = (
+        Path(output) if output else media_root / f"{scene}_play{play}.mp4"
+    )
+
+    def render_shard(index):
+        env = dict(os.environ)
+        env[SHARD_ENV] = f"{index}/{jobs}"
+        # The partial movies of the shards would share the same hash.
+        return run_manim(
+            script, scene, quality,
+            media_root / "shards" / scene / str(play) / str(index),
+            f"{scene}_play{play}_{index}", env,
+            ["--disable_caching", "-n", f"{play},{play}"],
+        )
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        videos = pool.map(render_shard, range(jobs))
+        videos = [v for v in videos if v and v.stat().st_size]
+
+    concat_videos(videos, output)
+    return output
+
+
+def measure(script, scene, section=None, quality="l"):
+    """Render ``scene``, or one of its sections, and return its metrics."""
+    script = Path(script).resolve()
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ)
+        env[TRACE_ENV] = os.path.join(tmp, "trace.json")
+        if section:
+            env[SECTION_ENV] = section
+
+        # Caching is disabled, a fresh render is measured every time.
+        start = time.perf_counter()
+        process = subprocess.Popen(
+            _manim_command(
+                script, scene, quality, tmp, scene,
+                ["--disable_caching", "--progress_bar", "none"],
+            ),
+            cwd=script.parent,
+            env=env,
+            stdout=subprocess.DEVNULL,
+        )
+        _, status, usage = os.wait4(process.pid, 0)
+        wall = time.perf_counter() - start
+        process.returncode = os.waitstatus_to_exitcode(status)
+        if process.returncode:
+            raise subprocess.CalledProcessError(
+                process.returncode, process.args
+            )
+
+        with open(trace_path(env[TRACE_ENV], section)) as f:
+            summary = json.load(f)["otherData"]
+
+    hits = summary["tex_cache_hits"] or 0
+    lookups = hits + (summary["tex_cache_misses"] or 0)
+    return {
+        "wall_s": wall,
+        "frames": summary["frames"],
+        "fps": summary["frames"] / wall,
+        "peak_rss_kib": usage.ru_maxrss,
+        "tex_cache_hit_rate": hits / lookups if lookups else None,
+    }
+
+
+def bench(quality="l", output=None, baseline=BENCH_BASELINE, threshold=10.0,
+          update_baseline=False):
+    """Render the ``BENCH_SCENES`` and compare their times to ``baseline``.
+
+    Returns the results and the names of the renders that got slower by
+    more than ``threshold`` percent.
+    """
+    results = {}
+    for script, scene in BENCH_SCENES:
+        script = ROOT / script
+        results[scene] = measure(script, scene, quality=quality)
+        for section in read_sections(script, scene):
+            results[f"{scene}.{section}"] = measure(
+                script, scene, section, quality
+            )
+    results = {"quality": quality, "results": results}
+
+    if output:
+        Path(output).write_text(json.dumps(results, indent=2) + "\n")
+
+    baseline = Path(baseline)
+    regressions = []
+    if update_baseline:
+        baseline.parent.mkdir(parents=True, exist_ok=True)
+        baseline.write_text(json.dumps(results, indent=2) + "\n")
+    elif baseline.exists():
+        reference = json.loads(baseline.read_text())
+        if reference["quality"] != quality:
+            raise ValueError(
+                f"{baseline} was recorded at quality {reference['quality']}"
+            )
+        for name, metrics in results["results"].items():
+            previous = reference["results"].get(name)
+            if previous and (
+                metrics["wall_s"] > previous["wall_s"] * (1 + threshold / 100)
+            ):
+                regressions.append(name)
+    return results, regressions
+
+
+def watch(script, scene, quality="l", jobs=None, output=None, interval=0.5):
+    """Render ``scene`` again every time ``script``, or a module it can
+    import, is saved."""
+    script = Path(script)
+    mtimes = None
+    while True:
+        current = {
+            path: path.stat().st_mtime
+            for path in [script.resolve(), *module_files(script)]
+        }
+        if current != mtimes:
+            mtimes = current
+            try:
+                print(render_sections(
+                    script, scene, quality, jobs, output, precompile=False
+                ))
+            except (subprocess.CalledProcessError, SyntaxError, ValueError) as exc:
+                print(f"Render failed: {exc}")
+        time.sleep(interval)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    sections = commands.add_parser(
+        "sections", help="render each section in its own process"
+    )
+    sections.add_argument("script", help="path of the scene file")
+    sections.add_argument("scene", help="name of the scene class")
+    sections.add_argument("-q", "--quality", default="l",
+                          choices=["l", "m", "h", "p", "k"])
+    sections.add_argument("-j", "--jobs", type=int, default=None,
+                          help="number of worker processes")
+    sections.add_argument("-o", "--output", default=None,
+                          help="path of the stitched video")
+    sections.add_argument("--no-precompile", dest="precompile",
+                          action="store_false",
+                          help="do not compile the LaTeX ahead of the render")
+    sections.add_argument("--tiles", type=int, default=None,
+                          help="rasterize every frame in this many bands "
+                               "in parallel")
+
+    watch_ = commands.add_parser(
+        "watch", help="render the edited sections every time the file changes"
+    )
+    watch_.add_argument("script", help="path of the scene file")
+    watch_.add_argument("scene", help="name of the scene class")
+    watch_.add_argument("-q", "--quality", default="l",
+                        choices=["l", "m", "h", "p", "k"])
+    watch_.add_argument("-j", "--jobs", type=int, default=None,
+                        help="number of worker processes")
+    watch_.add_argument("-o", "--output", default=None,
+                        help="path of the stitched video")
+
+    shard = commands.add_parser(
+        "shard", help="render one play split across processes"
+    )
+    shard.add_argument("script", help="path of the scene file")
+    shard.add_argument("scene", help="name of the scene class")
+    shard.add_argument("play", type=int,
+                       help="number of the play, as given to manim's -n")
+    shard.add_argument("-q", "--quality", default="l",
+                       choices=["l", "m", "h", "p", "k"])
+    shard.add_argument("-j", "--jobs", type=int, default=None,
+                       help="number of worker processes")
+    shard.add_argument("-o", "--output", default=None,
+                       help="path of the joined video")
+
+    bench_ = commands.add_parser(
+        "bench", help="time the renders of the scenes and their sections"
+    )
+    bench_.add_argument("-q", "--quality", default="l",
+                        choices=["l", "m", "h", "p", "k"])
+    bench_.add_argument("-o", "--output", default=None,
+                        help="path of the JSON results")
+    bench_.add_argument("--baseline", default=BENCH_BASELINE,
+                        help="results to compare with")
+    bench_.add_argument("--threshold", type=float, default=10.0,
+                        help="slowdown, in percent, reported as a regression")
+    bench_.add_argument("--update-baseline", action="store_true",
+                        help="store the results as the new baseline")
+
+    serve = commands.add_parser(
+        "serve", help="keep manim and the scenes loaded, render on request"
+    )
+    serve.add_argument("scripts", nargs="*",
+                       help="scene files to preload, all of them by default")
+    serve.add_argument("--socket", default=daemon.DEFAULT_SOCKET)
+
+    submit = commands.add_parser("submit", help="send a job to the server")
+    submit.add_argument("script", help="path of the scene file")
+    submit.add_argument("scene", help="name of the scene class")
+    submit.add_argument("-s", "--section", default=None)
+    submit.add_argument("-q", "--quality", default="l",
+                        choices=list(daemon.QUALITIES))
+    submit.add_argument("-o", "--output", default=None,
+                        help="name of the video file")
+    submit.add_argument("--socket", default=daemon.DEFAULT_SOCKET)
+
+    args = parser.parse_args(argv)
+    if args.command == "sections":
+        output = render_sections(
+            args.script, args.scene, args.quality, args.jobs, args.output,
+            args.precompile, args.tiles,
+        )
+        print(output)
+    elif args.command == "watch":
+        watch(args.script, args.scene, args.quality, args.jobs, args.output)
+    elif args.command == "shard":
+        print(render_play_shards(
+            args.script, args.scene, args.play, args.quality, args.jobs,
+            args.output,
+        ))
+    elif args.command == "bench":
+        results, regressions = bench(
+            args.quality, args.output, args.baseline, args.threshold,
+            args.update_baseline,
+        )
+        for name, metrics in results["results"].items():
+            print(
+                f"{name:32} {metrics['wall_s']:8.2f}s "
+                f"{metrics['fps']:7.1f} fps "
+                f"{metrics['peak_rss_kib'] / 1024:7.0f} MiB"
+            )
+        if regressions:
+            sys.exit(
+                f"Slower than {args.baseline} by more than "
+                f"{args.threshold}%: {', '.join(regressions)}"
+            )
+    elif args.command == "serve":
+        scripts = args.scripts or sorted(ROOT.glob("*/main.py"))
+        with daemon.RenderServer(scripts, args.socket) as server:
+            print(f"Listening on {args.socket}")
+            server.serve_forever()
+    elif args.command == "submit":
+        reply = daemon.submit(
+            {
+                "script": str(Path(args.script).resolve()),
+                "scene": args.scene,
+                "section": args.section,
+                "quality": args.quality,
+                "output": args.output,
+            },
+            args.socket,
+        )
+        if not reply["ok"]:
+            sys.exit(reply["error"])
+        print(reply["output"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Images shared by ``common.assets`` fade and change like other images."""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+manim = pytest.importorskip("manim")
+
+from manim import FadeIn, FadeOut, Scene, tempconfig
+from PIL import Image
+
+from common.assets import AssetRegistry
+
+
+@pytest.fixture
+def assets(tmp_path):
+    pixels = np.zeros((4, 6, 4), dtype=np.uint8)
+    pixels[:, :, 0] = 200
+    pixels[:, :, 3] = 255
+    Image.fromarray(pixels).save(tmp_path / "red.png")
+    return AssetRegistry(tmp_path, cache_dir=tmp_path / "cache")
+
+
+def test_fade_shared_image(assets, tmp_path):
+    image = assets.image("red.png", invert=True)
+    other = assets.image("red.png", invert=True)
+
+    class Fades(Scene):
+        def construct(self):
+            self.play(FadeIn(image))
+            self.play(FadeOut(image))
+
+    with tempconfig({
+        "dry_run": True,
+        "disable_caching": True,
+        "media_dir": str(tmp_path / "media"),
+    }):
+        Fades().render()
+
+    # The pixels of the other images are left as they were.
+    assert not other.pixel_array.flags.writeable
+    np.testing.assert_array_equal(other.pixel_array[:, :, 0], 55)
+    np.testing.assert_array_equal(other.pixel_array[:, :, 3], 255)
+
+
+def test_set_opacity(assets):
+    image = assets.image("red.png").set_opacity(0.5)
+    np.testing.assert_array_equal(image.pixel_array[:, :, 3], 127)
+    np.testing.assert_array_equal(
+        assets.pixels("red.png")[:, :, 3], 255
+    )
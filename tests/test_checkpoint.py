@@ -0,0 +1,93 @@
+"""Snapshots taken by ``common.checkpoint`` restore the same scene state."""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+manim = pytest.importorskip("manim")
+
+from manim import BLUE, RED, RIGHT, Circle, Square, Transform, tempconfig
+
+from common import checkpoint
+from common.env import CHECKPOINT_ENV, SECTION_ENV
+from common.sections import SectionScene
+
+
+class TwoSections(SectionScene):
+
+    sections = ("first", "second")
+    checkpoint_attrs = ("shapes",)
+
+    def setup(self):
+        super().setup()
+        self.ran = []  # Sections run, not restored from a snapshot.
+
+    def first(self):
+        self.ran.append("first")
+        square = Square(color=BLUE, fill_opacity=0.5).shift(RIGHT)
+        self.shapes = {"square": square}
+        self.add(square)
+        self.play(Transform(square, Circle(color=RED)))
+
+    def second(self):
+        self.ran.append("second")
+        self.play(self.shapes["square"].animate.shift(2 * RIGHT))
+
+
+def _state(mobjects):
+    return [
+        (type(mob).__name__, mob.points, mob.fill_rgbas, mob.stroke_rgbas)
+        for top in mobjects
+        for mob in top.get_family()
+    ]
+
+
+def _assert_same(actual, expected):
+    assert len(actual) == len(expected)
+    for (name, *arrays), (expected_name, *expected_arrays) in zip(
+        actual, expected
+    ):
+        assert name == expected_name
+        for array, expected_array in zip(arrays, expected_arrays):
+            np.testing.assert_array_equal(array, expected_array)
+
+
+def _config(tmp_path):
+    return tempconfig({
+        "dry_run": True,
+        "disable_caching": True,
+        "media_dir": str(tmp_path / "media"),
+    })
+
+
+def _render(tmp_path):
+    with _config(tmp_path):
+        scene = TwoSections()
+        scene.render()
+    return scene
+
+
+def test_round_trip(tmp_path):
+    scene = _render(tmp_path)
+    path = tmp_path / "snapshot.npz"
+    checkpoint.save(scene, path)
+
+    with _config(tmp_path):
+        restored = TwoSections()
+        checkpoint.load(restored, path)
+
+    _assert_same(_state(restored.mobjects), _state(scene.mobjects))
+    assert restored.shapes["square"] is restored.mobjects[0]
+
+
+def test_resume_section(tmp_path, monkeypatch):
+    monkeypatch.setenv(CHECKPOINT_ENV, str(tmp_path / "checkpoints"))
+    full = _render(tmp_path)
+    assert full.ran == ["first", "second"]
+    assert checkpoint.checkpoint_path(full, "first").exists()
+
+    monkeypatch.setenv(SECTION_ENV, "second")
+    resumed = _render(tmp_path)
+
+    # The first section comes from its snapshot, it is not played again.
+    assert resumed.ran == ["second"]
+    _assert_same(_state(resumed.mobjects), _state(full.mobjects))